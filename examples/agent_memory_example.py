@@ -19,14 +19,36 @@ Requirements:
 
 import asyncio
 import datetime
+from functools import lru_cache
 from typing import Optional
-from mcp_sqlite_memory_bank.server import _create_row_impl, _read_rows_impl, _update_rows_impl, _delete_rows_impl
+from mcp_sqlite_memory_bank.server import _read_rows_impl, _delete_rows_impl
 
 # Import additional functions for table management
+import atexit
 import sqlite3
 import os
+import sys
+import threading
+from mcp_sqlite_memory_bank.database import SQLITE_PRAGMAS
 from mcp_sqlite_memory_bank.utils import validate_identifier, validate_column_definition
 
+# One connection per thread: the async helpers below run their blocking SQLite
+# calls via asyncio.to_thread, and WAL lets those connections work concurrently
+_local = threading.local()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return this thread's PRAGMA-tuned connection, opening it on first use."""
+    conn: Optional[sqlite3.Connection] = getattr(_local, "conn", None)
+    if conn is None:
+        db_path = os.environ.get("DB_PATH", "./test.db")
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        atexit.register(conn.close)
+        _local.conn = conn
+    return conn
+
 
 def create_table(table_name: str, columns: list) -> dict:
     """Create a table with the given name and columns."""
@@ -35,20 +57,79 @@ def create_table(table_name: str, columns: list) -> dict:
         for column in columns:
             validate_column_definition(column)
 
-        # Connect to database
-        db_path = os.environ.get("DB_PATH", "./test.db")
-        with sqlite3.connect(db_path) as conn:
-            # Build column definitions
-            column_defs = []
-            for col in columns:
-                column_defs.append(f"{col['name']} {col['type']}")
-
-            # Create table
-            query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(column_defs)})"
-            conn.execute(query)
-            conn.commit()
+        conn = _get_conn()
+
+        # Build column definitions
+        column_defs = []
+        for col in columns:
+            column_defs.append(f"{col['name']} {col['type']}")
+
+        # Create table
+        query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(column_defs)})"
+        conn.execute(query)
+        conn.commit()
+
+        return {"success": True}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def create_tables_bulk(specs: list) -> dict:
+    """Create several tables, given as (table_name, columns) pairs, in one transaction."""
+    try:
+        queries = []
+        for table_name, columns in specs:
+            validate_identifier(table_name, "table name")
+            for column in columns:
+                validate_column_definition(column)
+            column_defs = ", ".join(f"{col['name']} {col['type']}" for col in columns)
+            queries.append(f"CREATE TABLE IF NOT EXISTS {table_name} ({column_defs})")
+
+        conn = _get_conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for query in queries:
+                conn.execute(query)
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+        return {"success": True}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def create_index(index_name: str, table_name: str, columns: list, unique: bool = False) -> dict:
+    """Create an index on the given table columns if it doesn't exist."""
+    try:
+        validate_identifier(index_name, "index name")
+        validate_identifier(table_name, "table name")
+        for column in columns:
+            validate_identifier(column, "column name")
+
+        conn = _get_conn()
+        conn.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})")
+        conn.commit()
+
+        return {"success": True}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def delete_duplicate_rows(table_name: str, columns: list) -> dict:
+    """Delete all but the newest row (highest rowid) for each distinct value of the given columns."""
+    try:
+        validate_identifier(table_name, "table name")
+        for column in columns:
+            validate_identifier(column, "column name")
 
-            return {"success": True}
+        conn = _get_conn()
+        key = ", ".join(columns)
+        cur = conn.execute(f"DELETE FROM {table_name} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table_name} GROUP BY {key})")
+        conn.commit()
+
+        return {"success": True, "rows_affected": cur.rowcount}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -56,19 +137,67 @@ def create_table(table_name: str, columns: list) -> dict:
 def list_tables() -> dict:
     """List all tables in the database."""
     try:
-        db_path = os.environ.get("DB_PATH", "./test.db")
-        with sqlite3.connect(db_path) as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = [row[0] for row in cur.fetchall()]
-            return {"success": True, "tables": tables}
+        cur = _get_conn().execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+        tables = [row[0] for row in cur.fetchall()]
+        return {"success": True, "tables": tables}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+@lru_cache(maxsize=128)
+def _insert_sql(table_name: str, columns: tuple) -> str:
+    """Build (and validate) the INSERT statement for one table/column shape."""
+    validate_identifier(table_name, "table name")
+    for column in columns:
+        validate_identifier(column, "column name")
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+@lru_cache(maxsize=128)
+def _update_sql(table_name: str, columns: tuple, where_columns: tuple) -> str:
+    """Build (and validate) the UPDATE statement for one table/column shape."""
+    validate_identifier(table_name, "table name")
+    for column in columns + where_columns:
+        validate_identifier(column, "column name")
+    query = f"UPDATE {table_name} SET {', '.join(f'{col}=?' for col in columns)}"
+    if where_columns:
+        query += f" WHERE {' AND '.join(f'{col}=?' for col in where_columns)}"
+    return query
+
+
 def create_row(table_name: str, data: dict) -> dict:
     """Create a row in the given table."""
-    return _create_row_impl(table_name, data)
+    try:
+        # Identical SQL text also lets sqlite3 reuse its prepared statement cache
+        columns = tuple(sorted(data))
+        conn = _get_conn()
+        cur = conn.execute(_insert_sql(table_name, columns), tuple(data[col] for col in columns))
+        conn.commit()
+        return {"success": True, "id": cur.lastrowid}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def create_rows_bulk(table_name: str, rows: list) -> dict:
+    """Create several rows with the same columns using one executemany in one transaction."""
+    try:
+        if not rows:
+            return {"success": True, "rows_affected": 0}
+        columns = tuple(sorted(rows[0]))
+        if any(tuple(sorted(row)) != columns for row in rows):
+            raise ValueError("All rows must have the same columns")
+
+        conn = _get_conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_insert_sql(table_name, columns), [tuple(row[col] for col in columns) for row in rows])
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        return {"success": True, "rows_affected": len(rows)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 
 def read_rows(table_name: str, where: Optional[dict] = None) -> dict:
@@ -76,9 +205,41 @@ def read_rows(table_name: str, where: Optional[dict] = None) -> dict:
     return _read_rows_impl(table_name, where)
 
 
+def read_tables(table_names: list) -> dict:
+    """Read all rows from several tables in one read transaction on the shared connection."""
+    try:
+        for table_name in table_names:
+            validate_identifier(table_name, "table name")
+
+        conn = _get_conn()
+        tables = {}
+        # A single transaction gives every table the same snapshot and takes the read lock once
+        conn.execute("BEGIN")
+        try:
+            for table_name in table_names:
+                cur = conn.execute(f"SELECT * FROM {table_name}")
+                columns = [col[0] for col in cur.description]
+                tables[table_name] = [dict(zip(columns, row)) for row in cur.fetchall()]
+        finally:
+            conn.commit()
+        return {"success": True, "tables": tables}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 def update_rows(table_name: str, data: dict, where: Optional[dict] = None) -> dict:
     """Update rows in the given table."""
-    return _update_rows_impl(table_name, data, where)
+    try:
+        where = where or {}
+        columns = tuple(sorted(data))
+        where_columns = tuple(sorted(where))
+        params = tuple(data[col] for col in columns) + tuple(where[col] for col in where_columns)
+        conn = _get_conn()
+        cur = conn.execute(_update_sql(table_name, columns, where_columns), params)
+        conn.commit()
+        return {"success": True, "rows_affected": cur.rowcount}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 
 def delete_rows(table_name: str, where: Optional[dict] = None) -> dict:
@@ -86,95 +247,122 @@ def delete_rows(table_name: str, where: Optional[dict] = None) -> dict:
     return _delete_rows_impl(table_name, where)
 
 
+def upsert_row(table_name: str, conflict_cols: list, data: dict) -> dict:
+    """Insert a row, or update it in place when it conflicts on the given unique columns."""
+    try:
+        validate_identifier(table_name, "table name")
+        for column in list(data) + list(conflict_cols):
+            validate_identifier(column, "column name")
+
+        columns = list(data)
+        update_cols = [col for col in columns if col not in conflict_cols]
+        # When every column is a conflict column there is nothing left to update
+        action = f"DO UPDATE SET {', '.join(f'{col}=excluded.{col}' for col in update_cols)}" if update_cols else "DO NOTHING"
+        query = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT({', '.join(conflict_cols)}) {action}"
+        )
+
+        conn = _get_conn()
+        conn.execute(query, tuple(data.values()))
+        conn.commit()
+
+        return {"success": True}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 async def initialize_memory_schema():
     """Initialize the memory schema tables if they don't exist."""
     print("Initializing memory schema...")
 
-    # Get existing tables
-    tables_result = list_tables()
-    existing_tables = tables_result["tables"] if tables_result.get("success", False) else []
-
-    # Create project structure table if it doesn't exist
-    if "project_structure" not in existing_tables:
-        print("Creating project_structure table...")
-        create_table(
-            "project_structure",
-            [
-                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
-                {"name": "category", "type": "TEXT NOT NULL"},
-                {"name": "title", "type": "TEXT NOT NULL"},
-                {"name": "content", "type": "TEXT NOT NULL"},
-                {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
-            ],
-        )
-
-    # Create technical decisions table if it doesn't exist
-    if "technical_decisions" not in existing_tables:
-        print("Creating technical_decisions table...")
-        create_table(
-            "technical_decisions",
-            [
-                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
-                {"name": "decision_name", "type": "TEXT NOT NULL"},
-                {"name": "chosen_approach", "type": "TEXT NOT NULL"},
-                {"name": "alternatives", "type": "TEXT"},
-                {"name": "rationale", "type": "TEXT NOT NULL"},
-                {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
-            ],
-        )
-
-    # Create user preferences table if it doesn't exist
-    if "user_preferences" not in existing_tables:
-        print("Creating user_preferences table...")
-        create_table(
-            "user_preferences",
-            [
-                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
-                {"name": "preference_type", "type": "TEXT NOT NULL"},
-                {"name": "preference_value", "type": "TEXT NOT NULL"},
-                {"name": "context", "type": "TEXT"},
-                {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
-            ],
-        )
+    # IF NOT EXISTS makes this idempotent, so all four tables are created in a single transaction
+    create_tables_bulk(
+        [
+            (
+                "project_structure",
+                [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "category", "type": "TEXT NOT NULL"},
+                    {"name": "title", "type": "TEXT NOT NULL"},
+                    {"name": "content", "type": "TEXT NOT NULL"},
+                    {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
+                ],
+            ),
+            (
+                "technical_decisions",
+                [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "decision_name", "type": "TEXT NOT NULL"},
+                    {"name": "chosen_approach", "type": "TEXT NOT NULL"},
+                    {"name": "alternatives", "type": "TEXT"},
+                    {"name": "rationale", "type": "TEXT NOT NULL"},
+                    {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
+                ],
+            ),
+            (
+                "user_preferences",
+                [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "preference_type", "type": "TEXT NOT NULL"},
+                    {"name": "preference_value", "type": "TEXT NOT NULL"},
+                    {"name": "context", "type": "TEXT"},
+                    {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
+                ],
+            ),
+            (
+                "session_context",
+                [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "session_id", "type": "TEXT NOT NULL"},
+                    {"name": "topic", "type": "TEXT NOT NULL"},
+                    {"name": "progress_state", "type": "TEXT NOT NULL"},
+                    {"name": "next_steps", "type": "TEXT"},
+                    {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
+                ],
+            ),
+        ]
+    )
 
-    # Create session context table if it doesn't exist
-    if "session_context" not in existing_tables:
-        print("Creating session_context table...")
-        create_table(
-            "session_context",
-            [
-                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
-                {"name": "session_id", "type": "TEXT NOT NULL"},
-                {"name": "topic", "type": "TEXT NOT NULL"},
-                {"name": "progress_state", "type": "TEXT NOT NULL"},
-                {"name": "next_steps", "type": "TEXT"},
-                {"name": "timestamp", "type": "TEXT DEFAULT CURRENT_TIMESTAMP"},
-            ],
-        )
+    # One preference row per type, so preferences can be upserted in a single statement;
+    # sessions are looked up and updated by session_id, project entries filtered by category
+    indexes = [
+        ("ux_user_preferences_preference_type", "user_preferences", ["preference_type"], True),
+        ("ux_session_context_session_id", "session_context", ["session_id"], True),
+        ("ix_project_structure_category", "project_structure", ["category"], False),
+    ]
+    for index_name, table_name, columns, unique in indexes:
+        if unique:
+            # Databases written before the unique indexes existed may hold duplicates; keep the newest row
+            result = delete_duplicate_rows(table_name, columns)
+            if not result["success"]:
+                raise RuntimeError(f"Could not de-duplicate {table_name}: {result['error']}")
+        result = create_index(index_name, table_name, columns, unique=unique)
+        # The upserts below rely on these indexes, so a failure here must not go unnoticed
+        if not result["success"]:
+            raise RuntimeError(f"Could not create index {index_name}: {result['error']}")
 
 
 async def store_project_information():
     """Store information about the project structure."""
     print("\nStoring project information...")
 
-    # Store information about project architecture
-    create_row(
+    # Store information about project architecture and file organization
+    await asyncio.to_thread(
+        create_rows_bulk,
         "project_structure",
-        {
-            "category": "architecture",
-            "title": "SQLite Memory Bank Structure",
-            "content": "The project follows a modular design with server.py containing the FastMCP implementation, types.py defining data structures, and utils.py providing helper functions.",
-        },
-    )
-
-    # Store information about file organization
-    create_row(
-        "project_structure",
-        {
-            "category": "file_organization",
-            "title": "Project Layout",
-            "content": "The project uses a src/ layout with package code in src/mcp_sqlite_memory_bank/, examples in examples/, and tests in tests/.",
-        },
+        [
+            {
+                "category": "architecture",
+                "title": "SQLite Memory Bank Structure",
+                "content": "The project follows a modular design with server.py containing the FastMCP implementation, types.py defining data structures, and utils.py providing helper functions.",
+            },
+            {
+                "category": "file_organization",
+                "title": "Project Layout",
+                "content": "The project uses a src/ layout with package code in src/mcp_sqlite_memory_bank/, examples in examples/, and tests in tests/.",
+            },
+        ],
     )
 
 
@@ -183,7 +371,8 @@ async def store_technical_decision():
     print("\nStoring technical decision...")
 
     # Store decision about API design
-    create_row(
+    await asyncio.to_thread(
+        create_row,
         "technical_decisions",
         {
             "decision_name": "API Design Pattern",
@@ -198,28 +387,17 @@ async def store_user_preference():
     """Store user preferences."""
     print("\nStoring user preference...")
 
-    # Check if preference already exists
-    existing_prefs = read_rows("user_preferences", {"preference_type": "code_style"})
-
-    if existing_prefs and existing_prefs.get("success", False) and existing_prefs.get("rows", []):
-        # Update existing preference
-        print("Updating existing user preference...")
-        update_rows(
-            "user_preferences",
-            {"preference_value": "explicit type annotations", "context": "User prefers explicit type annotations for all functions and variables"},
-            {"id": existing_prefs["rows"][0]["id"]},
-        )
-    else:
-        # Create new preference
-        print("Creating new user preference...")
-        create_row(
-            "user_preferences",
-            {
-                "preference_type": "code_style",
-                "preference_value": "explicit type annotations",
-                "context": "User prefers explicit type annotations for all functions and variables",
-            },
-        )
+    # Insert or update the preference in a single statement
+    await asyncio.to_thread(
+        upsert_row,
+        "user_preferences",
+        ["preference_type"],
+        {
+            "preference_type": "code_style",
+            "preference_value": "explicit type annotations",
+            "context": "User prefers explicit type annotations for all functions and variables",
+        },
+    )
 
 
 async def start_new_session():
@@ -247,53 +425,56 @@ async def retrieve_and_display_memory():
     """Retrieve and display memory from all tables."""
     print("\nRetrieving memory...")
 
-    # Retrieve project structure
-    project_info = read_rows("project_structure")
-    if project_info.get("success", False) and project_info.get("rows", []):
-        print("\n--- Project Structure ---")
-        for item in project_info["rows"]:
-            print(f"[{item['category']}] {item['title']}: {item['content'][:50]}...")
-
-    # Retrieve technical decisions
-    decisions = read_rows("technical_decisions")
-    if decisions.get("success", False) and decisions.get("rows", []):
-        print("\n--- Technical Decisions ---")
-        for item in decisions["rows"]:
-            print(f"Decision: {item['decision_name']}")
-            print(f"Approach: {item['chosen_approach']}")
-            print(f"Rationale: {item['rationale'][:50]}...")
-
-    # Retrieve user preferences
-    preferences = read_rows("user_preferences")
-    if preferences.get("success", False) and preferences.get("rows", []):
-        print("\n--- User Preferences ---")
-        for item in preferences["rows"]:
-            print(f"{item['preference_type']}: {item['preference_value']}")
+    memory = read_tables(["project_structure", "technical_decisions", "user_preferences", "session_context"])
+    tables = memory.get("tables", {}) if memory.get("success", False) else {}
+
+    # Build the whole report and write it once instead of printing line by line
+    parts: list = []
+    parts_append = parts.append
+
+    # Display project structure
+    if tables.get("project_structure"):
+        parts_append("\n--- Project Structure ---\n")
+        for item in tables["project_structure"]:
+            parts_append(f"[{item['category']}] {item['title']}: {item['content'][:50]}...\n")
+
+    # Display technical decisions
+    if tables.get("technical_decisions"):
+        parts_append("\n--- Technical Decisions ---\n")
+        for item in tables["technical_decisions"]:
+            parts_append(f"Decision: {item['decision_name']}\n")
+            parts_append(f"Approach: {item['chosen_approach']}\n")
+            parts_append(f"Rationale: {item['rationale'][:50]}...\n")
+
+    # Display user preferences
+    if tables.get("user_preferences"):
+        parts_append("\n--- User Preferences ---\n")
+        for item in tables["user_preferences"]:
+            parts_append(f"{item['preference_type']}: {item['preference_value']}\n")
             if item.get("context"):
-                print(f"Context: {item['context']}")
-
-    # Retrieve session context
-    sessions = read_rows("session_context")
-    if sessions.get("success", False) and sessions.get("rows", []):
-        print("\n--- Session Context ---")
-        for item in sessions["rows"]:
-            print(f"Session {item['session_id']}: {item['topic']}")
-            print(f"Progress: {item['progress_state']}")
+                parts_append(f"Context: {item['context']}\n")
+
+    # Display session context
+    if tables.get("session_context"):
+        parts_append("\n--- Session Context ---\n")
+        for item in tables["session_context"]:
+            parts_append(f"Session {item['session_id']}: {item['topic']}\n")
+            parts_append(f"Progress: {item['progress_state']}\n")
             if item.get("next_steps"):
-                print(f"Next Steps: {item['next_steps']}")
+                parts_append(f"Next Steps: {item['next_steps']}\n")
+
+    sys.stdout.write("".join(parts))
 
 
 async def update_session_progress(session_id):
     """Update the session progress."""
     print("\nUpdating session progress...")
 
-    # Find the session
-    session = read_rows("session_context", {"session_id": session_id})
-    if session.get("success", False) and session.get("rows", []):
-        # Update progress
-        update_rows(
-            "session_context", {"progress_state": "completed", "next_steps": "Session demonstration complete"}, {"id": session["rows"][0]["id"]}
-        )
+    # session_id is unique, so update it directly and use the affected row count to detect a missing session
+    result = update_rows(
+        "session_context", {"progress_state": "completed", "next_steps": "Session demonstration complete"}, {"session_id": session_id}
+    )
+    if result.get("success", False) and result.get("rows_affected", 0):
         print(f"Updated session {session_id} progress to 'completed'")
     else:
         print(f"Session {session_id} not found")
@@ -306,10 +487,8 @@ async def main():
     # Initialize memory schema
     await initialize_memory_schema()
 
-    # Store various types of information
-    await store_project_information()
-    await store_technical_decision()
-    await store_user_preference()
+    # Store various types of information; the writes are independent, so run them concurrently
+    await asyncio.gather(store_project_information(), store_technical_decision(), store_user_preference())
 
     # Start a new session
     session_id = await start_new_session()
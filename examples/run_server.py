@@ -12,26 +12,12 @@ If you see import errors, ensure you are running this script from the project ro
 or that the package is installed in your environment.
 """
 
+import os
 import sys
 
-
 # --- Import FastMCP app and FastAPI ---
 try:
     from mcp_sqlite_memory_bank.server import app as mcp_app
-
-    try:
-        print("[DEBUG-top] mcp_app type:", type(mcp_app))
-        print("[DEBUG-top] mcp_app._tools:", getattr(mcp_app, "_tools", None))
-        print("[DEBUG-top] mcp_app dir:", dir(mcp_app))
-        for attr in dir(mcp_app):
-            if not attr.startswith("__"):
-                try:
-                    value = getattr(mcp_app, attr)
-                    print(f"[DEBUG-top] mcp_app.{attr}: type={type(value)} value={str(value)[:120]}")
-                except Exception as attr_e:
-                    print(f"[DEBUG-top] mcp_app.{attr}: <access error>")
-    except Exception as debug_e:
-        print("[DEBUG-top] Error accessing mcp_app attributes")
 except ImportError as e:
     print("ERROR: Could not import 'app' from 'mcp_sqlite_memory_bank.server'.")
     print("Tip: Run this script from the project root or install the package with:")
@@ -58,6 +44,24 @@ except ImportError:
 
 import argparse
 
+# Set MCP_DEBUG=1 to dump the FastMCP app's attributes at startup
+DEBUG = bool(os.environ.get("MCP_DEBUG"))
+
+if DEBUG:
+    try:
+        print("[DEBUG-top] mcp_app type:", type(mcp_app))
+        print("[DEBUG-top] mcp_app._tools:", getattr(mcp_app, "_tools", None))
+        print("[DEBUG-top] mcp_app dir:", dir(mcp_app))
+        for attr in dir(mcp_app):
+            if not attr.startswith("__"):
+                try:
+                    value = getattr(mcp_app, attr)
+                    print(f"[DEBUG-top] mcp_app.{attr}: type={type(value)} value={str(value)[:120]}")
+                except Exception as attr_e:
+                    print(f"[DEBUG-top] mcp_app.{attr}: <access error>")
+    except Exception as debug_e:
+        print("[DEBUG-top] Error accessing mcp_app attributes")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -70,8 +74,9 @@ def main():
 
     try:
         # --- Debug: Print mcp_app._tools at startup ---
-        print("[DEBUG] mcp_app type:", type(mcp_app))
-        print("[DEBUG] mcp_app._tools:", getattr(mcp_app, "_tools", None))
+        if DEBUG:
+            print("[DEBUG] mcp_app type:", type(mcp_app))
+            print("[DEBUG] mcp_app._tools:", getattr(mcp_app, "_tools", None))
         # --- Create FastAPI app and mount FastMCP ---
         fastapi_app = FastAPI(
             title="MCP SQLite Memory Bank API",
@@ -93,6 +98,10 @@ def main():
             import inspect
 
             try:
+                # Tools are registered once at import time, so build the listing on the first request and reuse it
+                tools = getattr(fastapi_app.state, "tools_cache", None)
+                if tools is not None:
+                    return {"success": True, "tools": tools, "tools_count": len(tools)}
                 if hasattr(mcp_app, "get_tools"):
                     tool_objs = mcp_app.get_tools()
                     if inspect.iscoroutine(tool_objs):
@@ -115,6 +124,7 @@ def main():
                             or ""
                         )
                         tools.append({"name": name, "doc": doc.strip()})
+                    fastapi_app.state.tools_cache = tools
                     return {"success": True, "tools": tools, "tools_count": len(tools)}
                 else:
                     return {"success": False, "error": "mcp_app.get_tools() not found"}
@@ -7,66 +7,172 @@ This script provides automated documentation generation for the SQLite Memory Ba
 """
 
 import ast
+import hashlib
 import inspect
+import io
 import json
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import re
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    # Optional: stdlib json produces the same bytes, only slower
+    orjson = None
+
+
+# JSON schema type for the outermost name of a type annotation
+_TYPE_MAP = {
+    "str": "string",
+    "String": "string",
+    "int": "integer",
+    "Integer": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "Boolean": "boolean",
+    "List": "array",
+    "list": "array",
+    "Dict": "object",
+    "dict": "object",
+}
+
+# Outermost (possibly dotted) type name and its subscript, e.g. "typing.Dict" and "str, Any"
+_OUTER_TYPE_RE = re.compile(r'(?:\w+\.)*(\w+)(?:\[(.*)\])?')
+
+
+def _json_bytes(data: Any) -> bytes:
+    """Serialize data as 2-space indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _json_schema_type(arg_type: str) -> str:
+    """Map a type annotation string to a JSON schema type, looking through Optional[...]."""
+    match = _OUTER_TYPE_RE.fullmatch(arg_type)
+    while match and match.group(1) == 'Optional' and match.group(2):
+        match = _OUTER_TYPE_RE.fullmatch(match.group(2))
+    return _TYPE_MAP.get(match.group(1), "string") if match else "string"
+
 
 class MCPDocumentationGenerator:
     """Automated API documentation generator for MCP tools."""
     
+    # Bump whenever the extracted tool metadata changes shape, to invalidate old caches
+    CACHE_VERSION = 4
+    
     def __init__(self, src_path: str = "src/mcp_sqlite_memory_bank"):
         self.src_path = Path(src_path)
         self.tools_path = self.src_path / "tools"
         self.output_path = Path("docs/generated")
         self.output_path.mkdir(parents=True, exist_ok=True)
+        self.cache_path = self.output_path / ".tool_cache.json"
+        self.cache = self._load_cache()
+        self.cache_misses = 0
+        
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load per-file extracted tool metadata from the previous run."""
+        try:
+            cache = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if cache.get('version') != self.CACHE_VERSION:
+            return {}
+        return cache.get('files', {})
+    
+    def _save_cache(self) -> None:
+        """Persist per-file extracted tool metadata for the next run."""
+        self.cache_path.write_text(json.dumps({'version': self.CACHE_VERSION, 'files': self.cache}), encoding='utf-8')
         
     def extract_tool_info(self, module_path: Path) -> List[Dict[str, Any]]:
         """Extract MCP tool information from a Python module."""
+        try:
+            cached_tools = self._cached_tools(module_path)
+        except OSError as e:
+            print(f"Error processing {module_path}: {e}")
+            return []
+        if cached_tools is not None:
+            return cached_tools
+        return self._store_module(module_path, self._parse_module(module_path))
+    
+    def _cached_tools(self, module_path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Return the previous extraction when the file is unchanged, by mtime or by content."""
+        cached = self.cache.get(str(module_path))
+        if not cached:
+            return None
+        mtime_ns = module_path.stat().st_mtime_ns
+        if cached['mtime_ns'] == mtime_ns:
+            return cached['tools']
+        if cached['sha1'] == hashlib.sha1(module_path.read_bytes()).hexdigest():
+            cached['mtime_ns'] = mtime_ns
+            return cached['tools']
+        return None
+    
+    def _parse_module(self, module_path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a module into a cache entry, or None on error.
+        
+        Has no side effects on the generator, so it can run in a worker process.
+        """
         tools = []
         
         try:
-            # Read the source code
-            content = module_path.read_text(encoding='utf-8')
-            tree = ast.parse(content)
+            mtime_ns = module_path.stat().st_mtime_ns
+            # Keep the raw bytes: ast.parse decodes them itself, so no str copy is needed
+            content_bytes = module_path.read_bytes()
             
-            # Find all function definitions with @mcp.tool decorator
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Check for @mcp.tool decorator
-                    has_mcp_decorator = False
-                    for decorator in node.decorator_list:
-                        # Check for @mcp.tool (attribute access)
-                        if (isinstance(decorator, ast.Attribute) and 
-                            isinstance(decorator.value, ast.Name) and
-                            decorator.value.id == 'mcp' and
-                            decorator.attr == 'tool'):
-                            has_mcp_decorator = True
-                            break
-                        # Check for @mcp.tool() (function call)
-                        elif (isinstance(decorator, ast.Call) and
-                              isinstance(decorator.func, ast.Attribute) and
-                              isinstance(decorator.func.value, ast.Name) and
-                              decorator.func.value.id == 'mcp' and
-                              decorator.func.attr == 'tool'):
-                            has_mcp_decorator = True
-                            break
-                    
-                    if has_mcp_decorator:
-                        tool_info = self._extract_function_details(node, content)
+            # Every tool is decorated with @mcp.tool, so a module that never mentions it
+            # cannot define one and does not need to be parsed at all
+            if b'mcp.tool' not in content_bytes:
+                return {'mtime_ns': mtime_ns, 'sha1': hashlib.sha1(content_bytes).hexdigest(), 'tools': tools}
+            
+            tree = ast.parse(content_bytes, filename=str(module_path))
+            
+            # MCP tools are registered at module (or class) scope, so only the
+            # top-level statements need to be inspected, not every AST node
+            for node in tree.body:
+                candidates = node.body if isinstance(node, ast.ClassDef) else [node]
+                for candidate in candidates:
+                    if isinstance(candidate, (ast.FunctionDef, ast.AsyncFunctionDef)) and self._has_mcp_tool_decorator(candidate):
+                        tool_info = self._extract_function_details(candidate)
                         tool_info['module'] = module_path.stem
                         tool_info['file_path'] = str(module_path.relative_to(self.src_path))
                         tools.append(tool_info)
                         
         except Exception as e:
             print(f"Error processing {module_path}: {e}")
+            return None
             
-        return tools
+        return {'mtime_ns': mtime_ns, 'sha1': hashlib.sha1(content_bytes).hexdigest(), 'tools': tools}
+    
+    def _store_module(self, module_path: Path, entry: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record a freshly parsed module in the cache and return its tools."""
+        self.cache_misses += 1
+        if entry is None:
+            self.cache.pop(str(module_path), None)
+            return []
+        self.cache[str(module_path)] = entry
+        return entry['tools']
     
-    def _extract_function_details(self, node: ast.FunctionDef, content: str) -> Dict[str, Any]:
+    @staticmethod
+    def _has_mcp_tool_decorator(node: ast.FunctionDef) -> bool:
+        """Check whether a function is decorated with @mcp.tool or @mcp.tool()."""
+        for decorator in node.decorator_list:
+            # @mcp.tool() is a call wrapping the @mcp.tool attribute access
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            if (isinstance(decorator, ast.Attribute) and
+                    decorator.attr == 'tool' and
+                    isinstance(decorator.value, ast.Name) and
+                    decorator.value.id == 'mcp'):
+                return True
+        return False
+    
+    def _extract_function_details(self, node: ast.FunctionDef) -> Dict[str, Any]:
         """Extract detailed information about a function."""
         # Get docstring
         docstring = ast.get_docstring(node) or "No description available"
@@ -88,8 +194,13 @@ class MCPDocumentationGenerator:
         if node.returns:
             return_type = self._get_type_string(node.returns)
             
+        # Derived strings are computed once here so every output format can share them
+        args_str = ", ".join(f"{arg['name']}: {arg.get('type', 'Any')}" for arg in args)
+            
         return {
             'name': node.name,
+            'anchor': node.name.replace('_', '-'),
+            'signature': f"def {node.name}({args_str}) -> {return_type}:",
             'docstring': docstring,
             'description': parsed_doc.get('description', ''),
             'args': args,
@@ -101,39 +212,34 @@ class MCPDocumentationGenerator:
     
     def _parse_docstring(self, docstring: str) -> Dict[str, Any]:
         """Parse structured information from docstring."""
-        lines = docstring.split('\n')
-        
-        # Extract description (first paragraph)
+        # Single pass over pre-stripped lines: the first paragraph is the
+        # description, and every later paragraph opening with a ">>>" prompt is an example
         description_lines = []
-        for line in lines:
-            line = line.strip()
-            if not line:
-                break
-            description_lines.append(line)
-        description = ' '.join(description_lines)
-        
-        # Extract examples
         examples = []
-        in_example = False
         example_lines = []
+        state = 'description'
         
-        for line in lines:
-            if 'Example' in line and '>>>' in line:
-                in_example = True
-                example_lines = [line.strip()]
-            elif in_example:
-                if line.strip().startswith('>>>') or line.strip().startswith('{'):
-                    example_lines.append(line.strip())
-                elif not line.strip():
-                    if example_lines:
-                        examples.append('\n'.join(example_lines))
-                        example_lines = []
-                    in_example = False
+        for line in docstring.split('\n'):
+            line = line.strip()
+            if state == 'description':
+                if line:
+                    description_lines.append(line)
                 else:
-                    example_lines.append(line.strip())
+                    state = 'between'
+            elif state == 'between':
+                if line.startswith('>>>'):
+                    example_lines = [line]
+                    state = 'example'
+            elif line:
+                example_lines.append(line)
+            else:
+                examples.append('\n'.join(example_lines))
+                state = 'between'
         
-        if example_lines:
+        if state == 'example':
             examples.append('\n'.join(example_lines))
+        
+        description = ' '.join(description_lines)
             
         return {
             'description': description,
@@ -155,110 +261,69 @@ class MCPDocumentationGenerator:
     
     def generate_markdown_docs(self, tools: List[Dict[str, Any]]) -> str:
         """Generate Markdown API documentation."""
-        doc_lines = [
-            "# SQLite Memory Bank API Reference",
-            "",
-            "*Auto-generated from source code*",
-            "",
-            "This document provides comprehensive API reference for all MCP tools in the SQLite Memory Bank.",
-            "",
-            "## Tool Categories",
-            ""
-        ]
+        buf = io.StringIO()
+        write = buf.write
+        
+        write("# SQLite Memory Bank API Reference\n"
+              "\n"
+              "*Auto-generated from source code*\n"
+              "\n"
+              "This document provides comprehensive API reference for all MCP tools in the SQLite Memory Bank.\n"
+              "\n"
+              "## Tool Categories\n"
+              "\n")
         
         # Group tools by module
-        tools_by_module = {}
+        tools_by_module = defaultdict(list)
         for tool in tools:
-            module = tool['module']
-            if module not in tools_by_module:
-                tools_by_module[module] = []
-            tools_by_module[module].append(tool)
+            tools_by_module[tool['module']].append(tool)
         
         # Generate table of contents
-        doc_lines.append("### Table of Contents")
-        doc_lines.append("")
+        write("### Table of Contents\n\n")
         
         for module, module_tools in tools_by_module.items():
-            doc_lines.append(f"- **{module.title()}** ({len(module_tools)} tools)")
+            write(f"- **{module.title()}** ({len(module_tools)} tools)\n")
             for tool in module_tools:
-                doc_lines.append(f"  - [{tool['name']}](#{tool['name'].replace('_', '-')})")
-        doc_lines.append("")
+                write(f"  - [{tool['name']}](#{tool['anchor']})\n")
+        write("\n")
         
         # Generate detailed documentation for each module
         for module, module_tools in tools_by_module.items():
             # Get module file path from first tool in module
             module_file_path = module_tools[0]['file_path'] if module_tools else "Unknown"
-            doc_lines.extend([
-                f"## {module.title()} Tools",
-                "",
-                f"*Module: `{module_file_path}`*",
-                ""
-            ])
+            write(f"## {module.title()} Tools\n\n*Module: `{module_file_path}`*\n\n")
             
             for tool in module_tools:
-                doc_lines.extend(self._generate_tool_docs(tool))
-                doc_lines.append("")
+                self._generate_tool_docs(tool, buf)
+                write("\n")
         
-        return '\n'.join(doc_lines)
+        # Every line is newline-terminated; drop the final terminator to keep the previous "\n".join layout
+        return buf.getvalue()[:-1]
     
-    def _generate_tool_docs(self, tool: Dict[str, Any]) -> List[str]:
-        """Generate documentation for a single tool."""
-        lines = [
-            f"### `{tool['name']}`",
-            "",
-            tool['description'] or "No description available",
-            ""
-        ]
+    def _generate_tool_docs(self, tool: Dict[str, Any], buf: io.StringIO) -> None:
+        """Write the documentation for a single tool into buf."""
+        write = buf.write
+        write(f"### `{tool['name']}`\n\n{tool['description'] or 'No description available'}\n\n")
         
         # Function signature
-        args_str = ", ".join([
-            f"{arg['name']}: {arg.get('type', 'Any')}"
-            for arg in tool['args']
-        ])
-        return_type = tool.get('return_type', 'ToolResponse')
-        
-        lines.extend([
-            "**Signature:**",
-            "```python",
-            f"def {tool['name']}({args_str}) -> {return_type}:",
-            "```",
-            ""
-        ])
+        write(f"**Signature:**\n```python\n{tool['signature']}\n```\n\n")
         
         # Parameters
         if tool['args']:
-            lines.extend([
-                "**Parameters:**",
-                ""
-            ])
+            write("**Parameters:**\n\n")
             for arg in tool['args']:
                 arg_type = arg.get('type', 'Any')
-                lines.append(f"- `{arg['name']}` ({arg_type}): Parameter description")
-            lines.append("")
+                write(f"- `{arg['name']}` ({arg_type}): Parameter description\n")
+            write("\n")
         
         # Examples
         if tool['examples']:
-            lines.extend([
-                "**Examples:**",
-                ""
-            ])
+            write("**Examples:**\n\n")
             for example in tool['examples']:
-                lines.extend([
-                    "```python",
-                    example,
-                    "```",
-                    ""
-                ])
+                write(f"```python\n{example}\n```\n\n")
         
         # Source location
-        lines.extend([
-            f"*Source: {tool['file_path']}:{tool['line_number']}*",
-            "",
-            "---",
-            ""
-        ])
-        
-        return lines
+        write(f"*Source: {tool['file_path']}:{tool['line_number']}*\n\n---\n\n")
     
     def generate_json_api_spec(self, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate JSON API specification."""
@@ -333,18 +398,7 @@ class MCPDocumentationGenerator:
             arg_type = arg.get('type', 'string')
             
             # Map Python types to JSON schema types
-            if 'str' in arg_type or 'String' in arg_type:
-                schema_type = "string"
-            elif 'int' in arg_type or 'Integer' in arg_type:
-                schema_type = "integer"
-            elif 'bool' in arg_type or 'Boolean' in arg_type:
-                schema_type = "boolean"
-            elif 'List' in arg_type:
-                schema_type = "array"
-            elif 'Dict' in arg_type:
-                schema_type = "object"
-            else:
-                schema_type = "string"
+            schema_type = _json_schema_type(arg_type)
             
             properties[arg['name']] = {"type": schema_type}
             
@@ -358,54 +412,114 @@ class MCPDocumentationGenerator:
             "required": required
         }
     
-    def run(self) -> None:
-        """Generate all documentation formats."""
+    # Output file for each documentation format
+    OUTPUT_FILES = {
+        "markdown": "api_reference.md",
+        "openapi": "api_spec.json",
+        "summary": "tools_summary.json",
+    }
+    
+    def _write_if_changed(self, path: Path, data: bytes) -> bool:
+        """Write data to path unless the file already holds exactly those bytes.
+        
+        Leaving unchanged files alone preserves their mtimes for downstream tools.
+        """
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        path.write_bytes(data)
+        return True
+    
+    def run(self, formats: Tuple[str, ...] = ("markdown", "openapi", "summary")) -> None:
+        """Generate the requested documentation formats (all by default)."""
         print("🔄 Starting automated API documentation generation...")
         
         all_tools = []
+        processed_files = set()
         
-        # Process server.py file where MCP tools are registered
+        # server.py is where MCP tools are registered, followed by all Python files in the tools directory
+        module_files = []
         server_file = self.src_path / "server.py"
         if server_file.exists():
-            print(f"  📄 Processing {server_file.name}...")
-            tools = self.extract_tool_info(server_file)
-            all_tools.extend(tools)
-            print(f"    Found {len(tools)} MCP tools")
+            module_files.append(server_file)
+        module_files.extend(tool_file for tool_file in self.tools_path.glob("*.py") if not tool_file.name.startswith("__"))
+        
+        tools_by_file = {}
+        changed_files = []
+        for module_file in module_files:
+            try:
+                cached_tools = self._cached_tools(module_file)
+            except OSError:
+                cached_tools = None
+            if cached_tools is None:
+                changed_files.append(module_file)
+            else:
+                tools_by_file[module_file] = cached_tools
         
-        # Process all Python files in tools directory
-        for tool_file in self.tools_path.glob("*.py"):
-            if tool_file.name.startswith("__"):
-                continue
-                
-            print(f"  📄 Processing {tool_file.name}...")
-            tools = self.extract_tool_info(tool_file)
+        # Parsing is CPU-bound and independent per file, so changed files are parsed in parallel
+        if len(changed_files) > 1:
+            with ProcessPoolExecutor(max_workers=min(len(changed_files), os.cpu_count() or 1)) as executor:
+                entries = list(executor.map(self._parse_module, changed_files))
+        else:
+            entries = [self._parse_module(module_file) for module_file in changed_files]
+        for module_file, entry in zip(changed_files, entries):
+            tools_by_file[module_file] = self._store_module(module_file, entry)
+        
+        for module_file in module_files:
+            print(f"  📄 Processing {module_file.name}...")
+            tools = tools_by_file[module_file]
+            processed_files.add(str(module_file))
             all_tools.extend(tools)
             print(f"    Found {len(tools)} MCP tools")
         
         print(f"📊 Total MCP tools discovered: {len(all_tools)}")
         
+        # Forget files that no longer exist; their removal also changes the output
+        removed_files = set(self.cache) - processed_files
+        for removed_file in removed_files:
+            del self.cache[removed_file]
+        self._save_cache()
+        
+        output_files = [self.OUTPUT_FILES[output_format] for output_format in formats]
+        if not self.cache_misses and not removed_files and all((self.output_path / name).exists() for name in output_files):
+            print("✅ No source changes since the last run, documentation is up to date")
+            return
+        
         # Generate Markdown documentation
-        print("📝 Generating Markdown API reference...")
-        markdown_docs = self.generate_markdown_docs(all_tools)
-        markdown_path = self.output_path / "api_reference.md"
-        markdown_path.write_text(markdown_docs, encoding='utf-8')
-        print(f"  ✅ Markdown docs: {markdown_path}")
+        if "markdown" in formats:
+            print("📝 Generating Markdown API reference...")
+            markdown_docs = self.generate_markdown_docs(all_tools)
+            markdown_path = self.output_path / self.OUTPUT_FILES["markdown"]
+            if self._write_if_changed(markdown_path, markdown_docs.encode('utf-8')):
+                print(f"  ✅ Markdown docs: {markdown_path}")
+            else:
+                print(f"  ✅ Markdown docs unchanged: {markdown_path}")
         
         # Generate JSON API specification
-        print("🔧 Generating JSON API specification...")
-        json_spec = self.generate_json_api_spec(all_tools)
-        json_path = self.output_path / "api_spec.json"
-        json_path.write_text(json.dumps(json_spec, indent=2), encoding='utf-8')
-        print(f"  ✅ JSON API spec: {json_path}")
+        if "openapi" in formats:
+            print("🔧 Generating JSON API specification...")
+            json_spec = self.generate_json_api_spec(all_tools)
+            json_path = self.output_path / self.OUTPUT_FILES["openapi"]
+            if self._write_if_changed(json_path, _json_bytes(json_spec)):
+                print(f"  ✅ JSON API spec: {json_path}")
+            else:
+                print(f"  ✅ JSON API spec unchanged: {json_path}")
         
         # Generate tool summary
+        if "summary" in formats:
+            self._generate_summary(all_tools)
+        
+        print("✅ Automated API documentation generation completed!")
+        print(f"📁 Output directory: {self.output_path.absolute()}")
+    
+    def _generate_summary(self, all_tools: List[Dict[str, Any]]) -> None:
+        """Generate the JSON tool summary."""
         print("📋 Generating tool summary...")
         summary = {
             "total_tools": len(all_tools),
-            "tools_by_module": {
-                module: len([t for t in all_tools if t['module'] == module])
-                for module in set(tool['module'] for tool in all_tools)
-            },
+            "tools_by_module": dict(Counter(tool['module'] for tool in all_tools)),
             "generated_at": "auto-generated",
             "tools": [
                 {
@@ -417,12 +531,11 @@ class MCPDocumentationGenerator:
             ]
         }
         
-        summary_path = self.output_path / "tools_summary.json"
-        summary_path.write_text(json.dumps(summary, indent=2), encoding='utf-8')
-        print(f"  ✅ Tools summary: {summary_path}")
-        
-        print("✅ Automated API documentation generation completed!")
-        print(f"📁 Output directory: {self.output_path.absolute()}")
+        summary_path = self.output_path / self.OUTPUT_FILES["summary"]
+        if self._write_if_changed(summary_path, _json_bytes(summary)):
+            print(f"  ✅ Tools summary: {summary_path}")
+        else:
+            print(f"  ✅ Tools summary unchanged: {summary_path}")
 
 
 if __name__ == "__main__":
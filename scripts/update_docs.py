@@ -10,15 +10,23 @@ import subprocess
 import sys
 from pathlib import Path
 import shutil
+from typing import List
 
+from generate_api_docs import MCPDocumentationGenerator
 
-def run_command(cmd: str, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result."""
-    print(f"🔄 Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+
+def run_command(cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
+    """Run a command (argv list, no shell) and return the result."""
+    cmd_str = " ".join(cmd)
+    print(f"🔄 Running: {cmd_str}")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        # Mirror the shell's "command not found" exit status
+        result = subprocess.CompletedProcess(cmd, 127, stdout="", stderr=str(e))
     
     if check and result.returncode != 0:
-        print(f"❌ Command failed: {cmd}")
+        print(f"❌ Command failed: {cmd_str}")
         print(f"Error: {result.stderr}")
         sys.exit(1)
     
@@ -39,7 +47,9 @@ def main():
     
     # Step 1: Generate API documentation
     print("\n📚 Step 1: Generating API documentation...")
-    run_command("python scripts/generate_api_docs.py")
+    # Run the generator in-process instead of paying for a second interpreter start.
+    # Only the Markdown reference is consumed below (copied to docs/api.md).
+    MCPDocumentationGenerator().run(formats=("markdown",))
     
     # Step 2: Update main documentation if needed
     print("\n📝 Step 2: Checking documentation currency...")
@@ -60,9 +70,9 @@ def main():
     print("\n🔍 Step 3: Validating documentation...")
     
     # Check for broken links (if markdown-link-check is available)
-    link_check = run_command("markdown-link-check --version", check=False)
+    link_check = run_command(["markdown-link-check", "--version"], check=False)
     if link_check.returncode == 0:
-        run_command("markdown-link-check docs/*.md", check=False)
+        run_command(["markdown-link-check"] + [str(path) for path in sorted(Path("docs").glob("*.md"))], check=False)
     else:
         print("  ⚠️  markdown-link-check not available, skipping link validation")
     
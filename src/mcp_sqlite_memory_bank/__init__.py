@@ -12,38 +12,8 @@ Version: 1.6.6
 License: MIT
 """
 
-from .server import (
-    # Core tools
-    create_table,
-    drop_table,
-    rename_table,
-    list_tables,
-    describe_table,
-    list_all_columns,
-    create_row,
-    read_rows,
-    update_rows,
-    delete_rows,
-    run_select_query,
-    # FastMCP app
-    app,
-    # Constants
-    DB_PATH,
-)
-
-# Import search tools from the tools module
-from .tools import (
-    # Search tools
-    search_content,
-    explore_tables,
-    add_embeddings,
-    semantic_search,
-    find_related,
-    smart_search,
-    embedding_stats,
-    auto_semantic_search,
-    auto_smart_search,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from .types import (
     # Response types
@@ -72,6 +42,82 @@ from .types import (
     SqliteType,
 )
 
+if TYPE_CHECKING:
+    from .server import (
+        create_table,
+        drop_table,
+        rename_table,
+        list_tables,
+        describe_table,
+        list_all_columns,
+        create_row,
+        read_rows,
+        update_rows,
+        delete_rows,
+        run_select_query,
+        app,
+        DB_PATH,
+    )
+    from .tools import (
+        search_content,
+        explore_tables,
+        create_search_index,
+        add_embeddings,
+        semantic_search,
+        find_related,
+        smart_search,
+        embedding_stats,
+        auto_semantic_search,
+        auto_smart_search,
+    )
+
+# The server and tool modules pull in SQLAlchemy, FastMCP and the embedding
+# stack, so they are only imported when one of their names is first used
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    # Core tools
+    "create_table": ".server",
+    "drop_table": ".server",
+    "rename_table": ".server",
+    "list_tables": ".server",
+    "describe_table": ".server",
+    "list_all_columns": ".server",
+    "create_row": ".server",
+    "read_rows": ".server",
+    "update_rows": ".server",
+    "delete_rows": ".server",
+    "run_select_query": ".server",
+    # FastMCP app
+    "app": ".server",
+    # Constants
+    "DB_PATH": ".server",
+    # Search tools
+    "search_content": ".tools",
+    "explore_tables": ".tools",
+    "create_search_index": ".tools",
+    "add_embeddings": ".tools",
+    "semantic_search": ".tools",
+    "find_related": ".tools",
+    "smart_search": ".tools",
+    "embedding_stats": ".tools",
+    "auto_semantic_search": ".tools",
+    "auto_smart_search": ".tools",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import server and tool exports on first access (PEP 562)."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 # Package metadata
 __version__ = "1.6.12"
 __author__ = "Robert Meisner"
@@ -91,6 +137,7 @@ __all__ = [
     # Search tools
     "search_content",
     "explore_tables",
+    "create_search_index",
     "add_embeddings",
     "semantic_search",
     "find_related",
@@ -8,12 +8,19 @@ Author: Robert Meisner
 """
 
 import os
-import json
+import atexit
+import heapq
 import logging
+import threading
+import weakref
+import numpy as np
+from collections import Counter, OrderedDict
 from functools import wraps
-from typing import Dict, List, Any, Optional, Callable, cast
+from itertools import groupby
+from typing import Dict, List, Any, Optional, Callable, Tuple, cast
 from sqlalchemy import (
     create_engine,
+    Column,
     MetaData,
     Table,
     select,
@@ -21,12 +28,16 @@ from sqlalchemy import (
     update,
     delete,
     text,
-    inspect,
     and_,
     or_,
+    event,
+    bindparam,
+    literal_column,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool, StaticPool
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 from .types import (
@@ -40,13 +51,85 @@ from .types import (
     RelatedContentResponse,
     HybridSearchResponse,
 )
-from .semantic import get_semantic_engine, is_semantic_search_available
+from .semantic import (
+    deserialize_embeddings,
+    get_semantic_engine,
+    is_semantic_search_available,
+    normalize_embeddings,
+    serialize_embedding,
+)
 from .utils import (
     filter_embedding_columns,
     filter_embedding_from_rows,
     get_content_columns,
 )
 
+# PRAGMAs applied to every new SQLite connection: WAL lets readers and the writer
+# proceed concurrently, and synchronous=NORMAL is durable under WAL while avoiding
+# an fsync on every commit. busy_timeout makes a connection wait for a competing
+# writer instead of failing immediately with "database is locked".
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+# Prefix shared by the FTS5 index behind search_content and the shadow tables
+# SQLite creates for it (<prefix><table>_data, _idx, _docsize, _config)
+FTS_TABLE_PREFIX = "__fts_"
+
+# Upper bound on tables scored concurrently by semantic_search and search_content
+SEMANTIC_SEARCH_WORKERS = 8
+SEARCH_CONTENT_WORKERS = 8
+
+# SQLite's default cap on the terms of one compound SELECT (SQLITE_MAX_COMPOUND_SELECT)
+MAX_COMPOUND_SELECT = 500
+
+# Upper bound on cached CRUD statements; the cache is also cleared on every schema change
+STATEMENT_CACHE_SIZE = 256
+
+# Upper bound on decoded embedding matrices kept in memory, one per (table, column)
+EMBEDDING_CACHE_TABLES = 16
+
+
+def is_internal_table(table_name: str) -> bool:
+    """Check whether a table is managed by SQLite or the memory bank rather than the user."""
+    return table_name.startswith("sqlite_") or table_name.startswith(FTS_TABLE_PREFIX)
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Configure a freshly opened DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _is_text_column(column: Column) -> bool:
+    """Check whether a column holds searchable text (TEXT or VARCHAR affinity)."""
+    type_name = str(column.type).upper()
+    return "TEXT" in type_name or "VARCHAR" in type_name
+
+
+def _resolve_db_path(db_path: str) -> str:
+    """Normalise a database path: absolute for files, ':memory:' for in-memory databases."""
+    if db_path in (":memory:", ""):
+        return ":memory:"
+    return os.path.abspath(db_path)
+
+
+def _close_at_exit(ref: "weakref.ReferenceType[SQLiteMemoryDatabase]") -> None:
+    """Close a database instance at interpreter exit if it is still alive."""
+    db = ref()
+    if db is not None:
+        db.close()
+
 
 class SQLiteMemoryDatabase:
     """
@@ -62,15 +145,52 @@ class SQLiteMemoryDatabase:
 
     def __init__(self, db_path: str):
         """Initialize database connection and metadata."""
-        self.db_path = os.path.abspath(db_path)
-        self.engine: Engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
+        self.db_path = _resolve_db_path(db_path)
+        self._in_memory = self.db_path == ":memory:"
+        if self._in_memory:
+            # Every new connection to :memory: is a separate empty database, so all
+            # callers must share the single connection that holds the schema and data
+            self.engine: Engine = create_engine(
+                "sqlite://",
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+                echo=False,
+            )
+        else:
+            # Pool long-lived connections so PRAGMAs run once per connection and the page
+            # cache stays warm; semantic_search checks out one connection per worker thread.
+            self.engine = create_engine(
+                f"sqlite:///{self.db_path}",
+                poolclass=QueuePool,
+                pool_size=5,
+                max_overflow=10,
+                pool_recycle=3600,
+                connect_args={"check_same_thread": False},
+                echo=False,
+            )
+        event.listen(self.engine, "connect", _apply_sqlite_pragmas)
         self.metadata = MetaData()
+        # SQLite's schema cookie as of the last reflection; bumped by any DDL on the file
+        self._schema_version: Optional[int] = None
+        self._col_index: Dict[str, Dict[str, Column]] = {}
+        self._text_columns: Dict[str, List[str]] = {}
+        # Statements for the CRUD paths, keyed by their shape; values are bound per call
+        self._statement_cache: Dict[Tuple[Any, ...], Any] = {}
+        # Decoded embedding matrices keyed by (table, column), each stored with the
+        # table signature it was loaded under; writes through this class bump _table_versions
+        self._embedding_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int, Any], np.ndarray, np.ndarray]]" = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        self._table_versions: Dict[str, int] = {}
 
         # Ensure database directory exists
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        if not self._in_memory:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
         # Initialize connection
-        self._refresh_metadata()
+        self._reflect_now()
+
+        # Dispose of pooled connections at interpreter exit without keeping the instance alive
+        atexit.register(_close_at_exit, weakref.ref(self))
 
     def close(self) -> None:
         """Close all database connections and dispose of the engine."""
@@ -80,18 +200,40 @@ class SQLiteMemoryDatabase:
         except Exception as e:
             logging.warning(f"Error closing database: {e}")
 
-    def __del__(self) -> None:
-        """Ensure cleanup when object is garbage collected."""
-        self.close()
+    def _read_schema_version(self) -> int:
+        """Read SQLite's schema cookie, which changes whenever any connection runs DDL."""
+        with self.get_connection() as conn:
+            return int(conn.exec_driver_sql("PRAGMA schema_version").scalar() or 0)
 
-    def _refresh_metadata(self) -> None:
-        """Refresh metadata to reflect current database schema."""
+    def _reflect_now(self) -> None:
+        """Reflect the schema unconditionally and rebuild the per-table column index."""
         try:
+            version = self._read_schema_version()
             self.metadata.clear()
-            self.metadata.reflect(bind=self.engine)
+            self.metadata.reflect(bind=self.engine, only=lambda name, _: not is_internal_table(name))
+            self._col_index = {name: {col.name: col for col in table.columns} for name, table in self.metadata.tables.items()}
+            self._text_columns = {name: [col.name for col in table.columns if _is_text_column(col)] for name, table in self.metadata.tables.items()}
+            self._statement_cache.clear()
+            with self._embedding_cache_lock:
+                self._embedding_cache.clear()
+            self._schema_version = version
         except SQLAlchemyError as e:
+            self._schema_version = None
             logging.warning(f"Failed to refresh metadata: {e}")
 
+    def _refresh_metadata(self) -> None:
+        """Refresh metadata only if the schema changed since the last reflection.
+
+        Reflection issues several queries per table, while the schema cookie is a
+        single cheap PRAGMA that also catches DDL from other connections.
+        """
+        try:
+            if self._schema_version is not None and self._read_schema_version() == self._schema_version:
+                return
+        except SQLAlchemyError as e:
+            logging.warning(f"Failed to read schema version: {e}")
+        self._reflect_now()
+
     @contextmanager
     def get_connection(self) -> Any:
         """Get a database connection with automatic cleanup."""
@@ -101,6 +243,22 @@ class SQLiteMemoryDatabase:
         finally:
             conn.close()
 
+    @contextmanager
+    def _write_transaction(self) -> Any:
+        """Get a connection inside BEGIN IMMEDIATE, committed on success and rolled back on error.
+
+        Taking the write lock up front makes read-then-write sequences atomic and
+        avoids a lock upgrade failing with SQLITE_BUSY halfway through a batch.
+        """
+        with self.get_connection() as conn:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
     def _ensure_table_exists(self, table_name: str) -> Table:
         """Get table metadata, refreshing if needed.
         Raises ValidationError if not found.
@@ -115,7 +273,7 @@ class SQLiteMemoryDatabase:
 
     def _validate_columns(self, table: Table, column_names: List[str], context: str = "operation") -> None:
         """Validate that all column names exist in the table."""
-        valid_columns = set(col.name for col in table.columns)
+        valid_columns = self._col_index.get(table.name) or {col.name: col for col in table.columns}
         for col_name in column_names:
             if col_name not in valid_columns:
                 raise ValidationError(f"Invalid column '{col_name}' for table " f"'{table.name}' in {context}")
@@ -128,6 +286,37 @@ class SQLiteMemoryDatabase:
         self._validate_columns(table, list(where.keys()), "WHERE clause")
         return [table.c[col_name] == value for col_name, value in where.items()]
 
+    def _where_shape(self, table: Table, where: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, bool], ...]:
+        """Validate WHERE columns and describe the clause shape: each column and whether it tests IS NULL."""
+        if not where:
+            return ()
+        self._validate_columns(table, list(where.keys()), "WHERE clause")
+        return tuple((col_name, value is None) for col_name, value in where.items())
+
+    def _bind_where(self, table: Table, stmt: Any, where_shape: Tuple[Tuple[str, bool], ...]) -> Any:
+        """Add a WHERE clause with one named bind parameter per compared column."""
+        if not where_shape:
+            return stmt
+        return stmt.where(and_(*[table.c[name].is_(None) if is_null else table.c[name] == bindparam(f"w_{name}") for name, is_null in where_shape]))
+
+    def _cached_statement(self, key: Tuple[Any, ...], build: Callable[[], Any]) -> Any:
+        """Return the statement cached under key, building it on first use."""
+        stmt = self._statement_cache.get(key)
+        if stmt is None:
+            if len(self._statement_cache) >= STATEMENT_CACHE_SIZE:
+                self._statement_cache.clear()
+            stmt = self._statement_cache[key] = build()
+        return stmt
+
+    @staticmethod
+    def _where_params(where: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bind parameter values for a WHERE clause built by _bind_where."""
+        return {f"w_{name}": value for name, value in (where or {}).items() if value is not None}
+
+    def _mark_table_changed(self, table_name: str) -> None:
+        """Record a write to a table so cached embedding matrices for it are reloaded."""
+        self._table_versions[table_name] = self._table_versions.get(table_name, 0) + 1
+
     def _execute_with_commit(self, stmt) -> Any:
         """Execute a statement with automatic connection mgmt and commit."""
         with self.get_connection() as conn:
@@ -176,7 +365,7 @@ class SQLiteMemoryDatabase:
                 conn.execute(text(sql))
                 conn.commit()
 
-            self._refresh_metadata()
+            self._reflect_now()
             return {"success": True}
 
         except SQLAlchemyError as e:
@@ -185,10 +374,9 @@ class SQLiteMemoryDatabase:
     def list_tables(self) -> ToolResponse:
         """List all user-created tables."""
         try:
-            with self.get_connection() as conn:
-                inspector = inspect(conn)
-                tables = [name for name in inspector.get_table_names() if not name.startswith("sqlite_")]
-            return {"success": True, "tables": tables}
+            # Reflection already excludes internal tables
+            self._refresh_metadata()
+            return {"success": True, "tables": sorted(self.metadata.tables)}
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to list tables: {str(e)}")
 
@@ -216,8 +404,11 @@ class SQLiteMemoryDatabase:
         """Drop a table."""
         try:
             self._ensure_table_exists(table_name)  # Validates existence
-            self._execute_with_commit(text(f"DROP TABLE {table_name}"))
-            self._refresh_metadata()
+            with self.get_connection() as conn:
+                conn.execute(text(f"DROP TABLE {table_name}"))
+                self._drop_fts_index(conn, table_name)
+                conn.commit()
+            self._reflect_now()
             return {"success": True}
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
@@ -230,18 +421,20 @@ class SQLiteMemoryDatabase:
             raise ValidationError("Old and new table names are identical")
 
         try:
+            self._refresh_metadata()
             self._ensure_table_exists(old_name)  # Validates old table exists
 
             # Check if new name already exists
-            with self.get_connection() as conn:
-                inspector = inspect(conn)
-                if new_name in inspector.get_table_names():
-                    raise ValidationError(f"Table '{new_name}' already exists")
+            if new_name in self.metadata.tables:
+                raise ValidationError(f"Table '{new_name}' already exists")
 
+            with self.get_connection() as conn:
+                # The search index is keyed by table name; create_search_index rebuilds it
+                self._drop_fts_index(conn, old_name)
                 conn.execute(text(f"ALTER TABLE {old_name} RENAME TO {new_name}"))
                 conn.commit()
 
-            self._refresh_metadata()
+            self._reflect_now()
             return {"success": True}
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
@@ -258,12 +451,96 @@ class SQLiteMemoryDatabase:
             self._validate_columns(table, list(data.keys()), "insert operation")
 
             result = self._execute_with_commit(insert(table).values(**data))
+            self._mark_table_changed(table_name)
             return {"success": True, "id": result.lastrowid}
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
                 raise e
             raise DatabaseError(f"Failed to insert into table {table_name}: {str(e)}")
 
+    def insert_rows_bulk(self, table_name: str, rows: List[Dict[str, Any]]) -> ToolResponse:
+        """Insert many rows in a single transaction.
+
+        Returns the new rowids in "ids", aligned with rows, like insert_row's "id".
+        """
+        if not rows:
+            raise ValidationError("Rows cannot be empty")
+
+        try:
+            table = self._ensure_table_exists(table_name)
+            for data in rows:
+                if not data:
+                    raise ValidationError("Data cannot be empty")
+                self._validate_columns(table, list(data.keys()), "bulk insert operation")
+
+            pk_columns = list(table.primary_key.columns)
+            rowid_alias = pk_columns[0].name if len(pk_columns) == 1 and str(pk_columns[0].type).upper() == "INTEGER" else None
+
+            stmt = insert(table)
+            ids: List[int] = []
+            with self._write_transaction() as conn:
+                # Consecutive rows with the same columns go through one executemany, keeping
+                # input order. The write lock means SQLite gives such a run consecutive rowids
+                # ending at last_insert_rowid(); runs that set the rowid themselves go row by row
+                for columns, group in groupby(rows, key=frozenset):
+                    run = list(group)
+                    if len(run) == 1 or rowid_alias in columns:
+                        ids.extend(conn.execute(stmt, data).lastrowid for data in run)
+                    else:
+                        conn.execute(stmt, run)
+                        last_id = conn.exec_driver_sql("SELECT last_insert_rowid()").scalar()
+                        ids.extend(range(last_id - len(run) + 1, last_id + 1))
+
+            self._mark_table_changed(table_name)
+            return {"success": True, "rows_affected": len(rows), "ids": ids}
+        except (ValidationError, SQLAlchemyError) as e:
+            if isinstance(e, ValidationError):
+                raise e
+            raise DatabaseError(f"Failed to bulk insert into table {table_name}: {str(e)}")
+
+    def upsert_rows_bulk(self, table_name: str, rows: List[Dict[str, Any]], match_columns: List[str]) -> ToolResponse:
+        """Update-or-insert many rows, matched on match_columns, in a single transaction.
+
+        Each result matches upsert_memory's response: updates report rows_affected
+        and the changed fields with their old and new values.
+        """
+        if not rows:
+            raise ValidationError("Rows cannot be empty")
+
+        try:
+            table = self._ensure_table_exists(table_name)
+            for data in rows:
+                if not data:
+                    raise ValidationError("Data cannot be empty")
+                self._validate_columns(table, list(data.keys()), "bulk upsert operation")
+            self._validate_columns(table, match_columns, "bulk upsert match")
+
+            results: List[Dict[str, Any]] = []
+            with self._write_transaction() as conn:
+                for data in rows:
+                    conditions = self._build_where_conditions(table, {col: data[col] for col in match_columns if col in data})
+
+                    # Rows matching nothing, or tables without an id column, get inserted
+                    existing = None
+                    if conditions and "id" in table.c:
+                        existing = conn.execute(select(table).where(and_(*conditions)).limit(1)).mappings().first()
+
+                    if existing and existing["id"]:
+                        row_id = existing["id"]
+                        result = conn.execute(update(table).where(table.c["id"] == row_id).values(**data))
+                        updated_fields = {key: {"old": existing[key], "new": value} for key, value in data.items() if existing[key] != value}
+                        results.append({"action": "updated", "id": row_id, "rows_affected": result.rowcount, "updated_fields": updated_fields})
+                    else:
+                        result = conn.execute(insert(table).values(**data))
+                        results.append({"action": "created", "id": result.lastrowid})
+
+            self._mark_table_changed(table_name)
+            return {"success": True, "results": results}
+        except (ValidationError, SQLAlchemyError) as e:
+            if isinstance(e, ValidationError):
+                raise e
+            raise DatabaseError(f"Failed to bulk upsert into table {table_name}: {str(e)}")
+
     def read_rows(
         self,
         table_name: str,
@@ -273,19 +550,17 @@ class SQLiteMemoryDatabase:
         """Read rows from a table with optional filtering."""
         try:
             table = self._ensure_table_exists(table_name)
-            stmt = select(table)
-
-            # Apply WHERE conditions
-            conditions = self._build_where_conditions(table, where or {})
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-
-            # Apply LIMIT
+            where_shape = self._where_shape(table, where)
+            stmt = self._cached_statement(
+                ("read", table_name, where_shape, bool(limit)),
+                lambda: self._bind_where(table, select(table), where_shape).limit(bindparam("row_limit") if limit else None),
+            )
+            params = self._where_params(where)
             if limit:
-                stmt = stmt.limit(limit)
+                params["row_limit"] = limit
 
             with self.get_connection() as conn:
-                result = conn.execute(stmt)
+                result = conn.execute(stmt, params)
                 rows = [dict(row._mapping) for row in result.fetchall()]
 
             return {"success": True, "rows": rows}
@@ -308,14 +583,19 @@ class SQLiteMemoryDatabase:
             table = self._ensure_table_exists(table_name)
             self._validate_columns(table, list(data.keys()), "update operation")
 
-            stmt = update(table).values(**data)
-
-            # Apply WHERE conditions
-            conditions = self._build_where_conditions(table, where or {})
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
+            where_shape = self._where_shape(table, where)
+            data_columns = tuple(data)
+            stmt = self._cached_statement(
+                ("update", table_name, data_columns, where_shape),
+                lambda: self._bind_where(table, update(table).values({name: bindparam(f"v_{name}") for name in data_columns}), where_shape),
+            )
+            params = self._where_params(where)
+            params.update({f"v_{name}": value for name, value in data.items()})
 
-            result = self._execute_with_commit(stmt)
+            with self.get_connection() as conn:
+                result = conn.execute(stmt, params)
+                conn.commit()
+            self._mark_table_changed(table_name)
             return {"success": True, "rows_affected": result.rowcount}
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
@@ -326,16 +606,15 @@ class SQLiteMemoryDatabase:
         """Delete rows from a table."""
         try:
             table = self._ensure_table_exists(table_name)
-            stmt = delete(table)
-
-            # Apply WHERE conditions
-            conditions = self._build_where_conditions(table, where or {})
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-            else:
+            where_shape = self._where_shape(table, where)
+            if not where_shape:
                 logging.warning(f"delete_rows called without WHERE clause on table {table_name}")
+            stmt = self._cached_statement(("delete", table_name, where_shape), lambda: self._bind_where(table, delete(table), where_shape))
 
-            result = self._execute_with_commit(stmt)
+            with self.get_connection() as conn:
+                result = conn.execute(stmt, self._where_params(where))
+                conn.commit()
+            self._mark_table_changed(table_name)
             return {"success": True, "rows_affected": result.rowcount}
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
@@ -359,20 +638,19 @@ class SQLiteMemoryDatabase:
             # Build SELECT columns
             if columns:
                 self._validate_columns(table, columns, "SELECT operation")
-                select_columns = [table.c[col_name] for col_name in columns]
-                stmt = select(*select_columns)
-            else:
-                stmt = select(table)
-
-            # Apply WHERE conditions
-            conditions = self._build_where_conditions(table, where or {})
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-
-            stmt = stmt.limit(limit)
+            where_shape = self._where_shape(table, where)
+            select_columns = tuple(columns or ())
+            stmt = self._cached_statement(
+                ("select", table_name, select_columns, where_shape),
+                lambda: self._bind_where(
+                    table, select(*[table.c[col_name] for col_name in select_columns]) if select_columns else select(table), where_shape
+                ).limit(bindparam("row_limit")),
+            )
+            params = self._where_params(where)
+            params["row_limit"] = limit
 
             with self.get_connection() as conn:
-                result = conn.execute(stmt)
+                result = conn.execute(stmt, params)
                 rows = [dict(row._mapping) for row in result.fetchall()]
 
             return {"success": True, "rows": rows}
@@ -384,14 +662,20 @@ class SQLiteMemoryDatabase:
     def list_all_columns(self) -> ToolResponse:
         """List all columns for all tables."""
         try:
+            # Costs a single PRAGMA unless the schema changed since the last reflection
             self._refresh_metadata()
-            schemas = {table_name: [col.name for col in table.columns] for table_name, table in self.metadata.tables.items()}
+            schemas = {table_name: list(columns) for table_name, columns in self._col_index.items()}
             return {"success": True, "schemas": schemas}
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to list all columns: {str(e)}")
 
-    def search_content(self, query: str, tables: Optional[List[str]] = None, limit: int = 50) -> ToolResponse:
-        """Perform full-text search across table content."""
+    def search_content(self, query: str, tables: Optional[List[str]] = None, limit: int = 50, prefix: bool = False) -> ToolResponse:
+        """Perform full-text search across table content.
+
+        With prefix=True only values starting with the query match. That LIKE is
+        sargable, so an index such as CREATE INDEX idx_notes_title ON notes(title
+        COLLATE NOCASE) turns the scan into an index range lookup.
+        """
         if not query or not query.strip():
             raise ValidationError("Search query cannot be empty")
         if limit < 1:
@@ -400,100 +684,23 @@ class SQLiteMemoryDatabase:
         try:
             self._refresh_metadata()
             search_tables = tables or list(self.metadata.tables.keys())
-            results = []
+            # Repeated terms are scanned once and weighted by their multiplicity
+            query_terms = list(Counter(query.lower().split()).items())
 
-            with self.get_connection() as conn:
-                for table_name in search_tables:
-                    if table_name not in self.metadata.tables:
-                        continue
+            searchable_tables = [name for name in search_tables if name in self.metadata.tables]
 
-                    table = self.metadata.tables[table_name]
-                    text_columns = [col for col in table.columns if "TEXT" in str(col.type).upper() or "VARCHAR" in str(col.type).upper()]
-
-                    if not text_columns:
-                        continue
-
-                    # Build search conditions and execute
-                    conditions = [col.like(f"%{query}%") for col in text_columns]
-                    stmt = select(table).where(or_(*conditions)).limit(limit)
-
-                    for row in conn.execute(stmt).fetchall():
-                        row_dict = dict(row._mapping)
-
-                        # Enhanced relevance calculation with multiple scoring factors
-                        relevance_scores = []
-                        matched_content = []
-                        query_lower = query.lower()
-                        query_terms = query_lower.split()
-
-                        for col in text_columns:
-                            if col.name in row_dict and row_dict[col.name]:
-                                content = str(row_dict[col.name]).lower()
-                                content_length = len(content)
-
-                                if query_lower in content:
-                                    # Factor 1: Exact phrase frequency (weighted higher)
-                                    exact_frequency = content.count(query_lower)
-                                    exact_score = (exact_frequency * 2.0) / content_length if content_length > 0 else 0
-
-                                    # Factor 2: Individual term frequency
-                                    term_score = 0.0
-                                    for term in query_terms:
-                                        if term in content:
-                                            term_score += content.count(term) / content_length if content_length > 0 else 0
-
-                                    # Factor 3: Position bonus (early matches score
-                                    # higher)
-                                    position_bonus = 0.0
-                                    first_occurrence = content.find(query_lower)
-                                    if first_occurrence != -1:
-                                        position_bonus = (content_length - first_occurrence) / content_length * 0.1
-
-                                    # Factor 4: Column importance (title/name columns
-                                    # get bonus)
-                                    column_bonus = 0.0
-                                    if any(
-                                        keyword in col.name.lower()
-                                        for keyword in [
-                                            "title",
-                                            "name",
-                                            "summary",
-                                            "description",
-                                        ]
-                                    ):
-                                        column_bonus = 0.2
-
-                                    # Combined relevance score
-                                    col_relevance = exact_score + term_score + position_bonus + column_bonus
-                                    relevance_scores.append(col_relevance)
-
-                                    # Enhanced matched content with context
-                                    snippet_start = max(0, first_occurrence - 50)
-                                    snippet_end = min(
-                                        len(row_dict[col.name]),
-                                        first_occurrence + len(query) + 50,
-                                    )
-                                    snippet = str(row_dict[col.name])[snippet_start:snippet_end]
-                                    if snippet_start > 0:
-                                        snippet = "..." + snippet
-                                    if snippet_end < len(str(row_dict[col.name])):
-                                        snippet = snippet + "..."
-
-                                    matched_content.append(f"{col.name}: {snippet}")
-
-                        total_relevance = sum(relevance_scores)
-                        if total_relevance > 0:
-                            results.append(
-                                {
-                                    "table": table_name,
-                                    "row_id": row_dict.get("id"),
-                                    "row_data": row_dict,
-                                    "matched_content": matched_content,
-                                    "relevance": round(total_relevance, 4),
-                                    "match_quality": ("high" if total_relevance > 0.5 else ("medium" if total_relevance > 0.1 else "low")),
-                                    "match_count": len(relevance_scores),
-                                }
-                            )
+            def search_table(table_name: str) -> List[Dict[str, Any]]:
+                return self._search_content_table(self.metadata.tables[table_name], query, query_terms, limit, prefix)
+
+            # Tables are independent, so scan and score them concurrently on pooled
+            # connections, as semantic_search does; merging in table order keeps ties stable
+            if len(searchable_tables) > 1 and not self._in_memory:
+                with ThreadPoolExecutor(max_workers=min(SEARCH_CONTENT_WORKERS, len(searchable_tables))) as executor:
+                    per_table_results = list(executor.map(search_table, searchable_tables))
+            else:
+                per_table_results = [search_table(name) for name in searchable_tables]
+
+            results = [result for table_results in per_table_results for result in table_results]
 
             # Sort by relevance and limit results
             def get_relevance(x: Dict[str, Any]) -> float:
@@ -502,8 +709,7 @@ class SQLiteMemoryDatabase:
                     return float(rel)
                 return 0.0
 
-            results.sort(key=get_relevance, reverse=True)
-            results = results[:limit]
+            results = heapq.nlargest(max(limit, 0), results, key=get_relevance)
 
             return {
                 "success": True,
@@ -517,6 +723,197 @@ class SQLiteMemoryDatabase:
                 raise e
             raise DatabaseError(f"Failed to search content: {str(e)}")
 
+    def _search_content_table(
+        self,
+        table: Table,
+        query: str,
+        query_terms: List[Tuple[str, int]],
+        limit: int,
+        prefix: bool,
+    ) -> List[Dict[str, Any]]:
+        """Find and score the rows of a single table matching a search_content query."""
+        table_name = table.name
+        query_lower = query.lower()
+        text_column_names = filter_embedding_columns(self._text_columns.get(table_name, []))
+        text_columns = [table.c[name] for name in text_column_names]
+
+        if not text_columns:
+            return []
+
+        # Column importance (title/name columns get a bonus) only depends on
+        # the column, so it is computed once per table rather than per row
+        column_bonuses = {
+            name: (0.2 if any(keyword in name.lower() for keyword in ("title", "name", "summary", "description")) else 0.0)
+            for name in text_column_names
+        }
+
+        with self.get_connection() as conn:
+            # Let an FTS5 index built by create_search_index pick the best bm25-ranked
+            # candidates; queries shorter than one trigram and tables without an
+            # up-to-date index fall back to a LIKE scan. Searching never builds the index.
+            fts_table = self._fts_index_name(conn, table, text_column_names) if len(query) >= 3 and not prefix else None
+            if prefix:
+                pattern = query.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+                stmt = select(table).where(or_(*[col.like(pattern, escape="/") for col in text_columns])).limit(limit)
+            elif fts_table:
+                stmt = select(table).where(
+                    text(f"rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :fts_query ORDER BY rank LIMIT :fts_limit)").bindparams(
+                        fts_query='"' + query.replace('"', '""') + '"', fts_limit=limit
+                    )
+                )
+            else:
+                conditions = [col.like(f"%{query}%") for col in text_columns]
+                stmt = select(table).where(or_(*conditions)).limit(limit)
+
+            rows = conn.execute(stmt).fetchall()
+
+        results = []
+        for row in rows:
+            row_dict = dict(row._mapping)
+
+            # Enhanced relevance calculation with multiple scoring factors
+            relevance_scores = []
+            matched_content = []
+
+            for col in text_columns:
+                if col.name in row_dict and row_dict[col.name]:
+                    raw = str(row_dict[col.name])
+                    content = raw.lower()
+                    content_length = len(content)
+                    first_occurrence = content.find(query_lower)
+
+                    if first_occurrence != -1:
+                        # Factor 1: Exact phrase frequency (weighted higher)
+                        exact_frequency = content.count(query_lower)
+                        exact_score = (exact_frequency * 2.0) / content_length
+
+                        # Factor 2: Individual term frequency
+                        # (a single-word query reuses the phrase count instead of rescanning)
+                        term_score = 0.0
+                        for term, multiplicity in query_terms:
+                            term_frequency = exact_frequency if term == query_lower else content.count(term)
+                            term_score += multiplicity * term_frequency / content_length
+
+                        # Factor 3: Position bonus (early matches score higher)
+                        position_bonus = (content_length - first_occurrence) / content_length * 0.1
+
+                        # Factor 4: Column importance
+                        col_relevance = exact_score + term_score + position_bonus + column_bonuses[col.name]
+                        relevance_scores.append(col_relevance)
+
+                        # Enhanced matched content with context
+                        snippet_start = max(0, first_occurrence - 50)
+                        snippet_end = first_occurrence + len(query) + 50
+                        prefix_mark = "..." if snippet_start > 0 else ""
+                        suffix_mark = "..." if snippet_end < len(raw) else ""
+                        matched_content.append(f"{col.name}: {prefix_mark}{raw[snippet_start:snippet_end]}{suffix_mark}")
+
+            total_relevance = sum(relevance_scores)
+            if total_relevance > 0:
+                results.append(
+                    {
+                        "table": table_name,
+                        "row_id": row_dict.get("id"),
+                        "row_data": row_dict,
+                        "matched_content": matched_content,
+                        "relevance": round(total_relevance, 4),
+                        "match_quality": ("high" if total_relevance > 0.5 else ("medium" if total_relevance > 0.1 else "low")),
+                        "match_count": len(relevance_scores),
+                    }
+                )
+
+        return results
+
+    def _fts_index_sql(self, table: Table, column_names: List[str]) -> Optional[List[str]]:
+        """Build the DDL for a table's external-content FTS5 index and its sync triggers.
+
+        Returns None for tables without an INTEGER PRIMARY KEY, whose rowids are not
+        stable enough to key an external-content index.
+        """
+        pk_columns = list(table.primary_key.columns)
+        if len(pk_columns) != 1 or str(pk_columns[0].type).upper() != "INTEGER":
+            return None
+
+        quote = self.engine.dialect.identifier_preparer.quote_identifier
+        fts_name = FTS_TABLE_PREFIX + table.name
+        fts, source, rowid = quote(fts_name), quote(table.name), quote(pk_columns[0].name)
+        columns = ", ".join(quote(name) for name in column_names)
+        new_values = ", ".join(f"new.{quote(name)}" for name in column_names)
+        old_values = ", ".join(f"old.{quote(name)}" for name in column_names)
+        watched = ", ".join(quote(name) for name in [pk_columns[0].name] + column_names)
+        content = table.name.replace("'", "''")
+        content_rowid = pk_columns[0].name.replace("'", "''")
+
+        insert_new = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.{rowid}, {new_values});"
+        delete_old = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.{rowid}, {old_values});"
+        return [
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{content}', content_rowid='{content_rowid}', tokenize='trigram')",
+            f"CREATE TRIGGER {quote(fts_name + '_ai')} AFTER INSERT ON {source} BEGIN {insert_new} END",
+            f"CREATE TRIGGER {quote(fts_name + '_ad')} AFTER DELETE ON {source} BEGIN {delete_old} END",
+            f"CREATE TRIGGER {quote(fts_name + '_au')} AFTER UPDATE OF {watched} ON {source} BEGIN {delete_old} {insert_new} END",
+        ]
+
+    def _fts_index_name(self, conn: Any, table: Table, column_names: List[str]) -> Optional[str]:
+        """Return the quoted name of a table's FTS5 index if it exists and matches its text columns.
+
+        Read-only: a missing or outdated index is reported as None, not rebuilt.
+        """
+        statements = self._fts_index_sql(table, column_names)
+        if statements is None:
+            return None
+
+        fts_name = FTS_TABLE_PREFIX + table.name
+        existing = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE name IN :names").bindparams(bindparam("names", expanding=True)),
+            {"names": [fts_name, f"{fts_name}_ai", f"{fts_name}_ad", f"{fts_name}_au"]},
+        )
+        # SQLite stores the DDL verbatim, so any schema drift shows up as a mismatch
+        if {row[0] for row in existing} != set(statements):
+            return None
+        return self.engine.dialect.identifier_preparer.quote_identifier(fts_name)
+
+    def create_search_index(self, table_name: str) -> ToolResponse:
+        """Build, or rebuild, the FTS5 trigram index search_content uses for a table.
+
+        The index is opt-in: it adds a virtual table and sync triggers, so every
+        later insert, update and delete on the table also maintains it.
+        """
+        try:
+            table = self._ensure_table_exists(table_name)
+            column_names = filter_embedding_columns(self._text_columns.get(table_name, []))
+            if not column_names:
+                raise ValidationError(f"Table '{table_name}' has no text columns to index")
+
+            statements = self._fts_index_sql(table, column_names)
+            if statements is None:
+                raise ValidationError(f"Table '{table_name}' needs an INTEGER PRIMARY KEY to be indexed")
+
+            with self.get_connection() as conn:
+                if self._fts_index_name(conn, table, column_names) is None:
+                    quote = self.engine.dialect.identifier_preparer.quote_identifier
+                    fts_name = quote(FTS_TABLE_PREFIX + table_name)
+                    self._drop_fts_index(conn, table_name)
+                    for statement in statements:
+                        conn.exec_driver_sql(statement)
+                    conn.exec_driver_sql(f"INSERT INTO {fts_name}({fts_name}) VALUES ('rebuild')")
+                    conn.commit()
+
+            self._reflect_now()
+            return {"success": True, "message": f"Search index ready for table '{table_name}'", "columns": column_names}
+
+        except (ValidationError, SQLAlchemyError) as e:
+            if isinstance(e, ValidationError):
+                raise e
+            raise DatabaseError(f"Failed to create search index for {table_name}: {str(e)}")
+
+    def _drop_fts_index(self, conn: Any, table_name: str) -> None:
+        """Drop a table's FTS5 index and sync triggers if present."""
+        quote = self.engine.dialect.identifier_preparer.quote_identifier
+        fts_name = FTS_TABLE_PREFIX + table_name
+        for suffix in ("_ai", "_ad", "_au"):
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {quote(fts_name + suffix)}")
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote(fts_name)}")
+
     def explore_tables(self, pattern: Optional[str] = None, include_row_counts: bool = True) -> ToolResponse:
         """Explore table structures and content."""
         try:
@@ -533,28 +930,27 @@ class SQLiteMemoryDatabase:
             }
 
             with self.get_connection() as conn:
+                # Read every table from one snapshot instead of an implicit transaction per query
+                conn.exec_driver_sql("BEGIN")
+                row_counts = self._count_rows(conn, table_names) if include_row_counts else {}
+
                 for table_name in table_names:
                     table = self.metadata.tables[table_name]
 
-                    # Build column info and identify text columns
-                    columns = []
-                    text_columns: List[str] = []
-
-                    for col in table.columns:
-                        col_data = {
+                    # Build column info
+                    columns = [
+                        {
                             "name": col.name,
                             "type": str(col.type),
                             "nullable": col.nullable,
                             "default": col.default,
                             "primary_key": col.primary_key,
                         }
-                        columns.append(col_data)
-
-                        if "TEXT" in str(col.type).upper() or "VARCHAR" in str(col.type).upper():
-                            text_columns.append(col.name)
+                        for col in table.columns
+                    ]
 
                     # Filter out embedding columns from text_columns for user-facing operations
-                    text_columns = filter_embedding_columns(text_columns)
+                    text_columns = filter_embedding_columns(self._text_columns.get(table_name, []))
 
                     table_info: Dict[str, Any] = {
                         "name": table_name,
@@ -564,8 +960,7 @@ class SQLiteMemoryDatabase:
 
                     # Add row count if requested
                     if include_row_counts:
-                        count_result = conn.execute(select(text("COUNT(*)")).select_from(table))
-                        row_count = count_result.scalar()
+                        row_count = row_counts[table_name]
                         table_info["row_count"] = row_count
                         exploration["total_rows"] += row_count
 
@@ -601,6 +996,17 @@ class SQLiteMemoryDatabase:
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to explore tables: {str(e)}")
 
+    def _count_rows(self, conn: Any, table_names: List[str]) -> Dict[str, int]:
+        """Count the rows of many tables with one UNION ALL query per MAX_COMPOUND_SELECT tables."""
+        quote = self.engine.dialect.identifier_preparer.quote_identifier
+        counts: Dict[str, int] = {}
+        for start in range(0, len(table_names), MAX_COMPOUND_SELECT):
+            chunk = table_names[start : start + MAX_COMPOUND_SELECT]
+            sql = " UNION ALL ".join(f"SELECT {idx}, COUNT(*) FROM {quote(name)}" for idx, name in enumerate(chunk))
+            for idx, count in conn.exec_driver_sql(sql):
+                counts[chunk[idx]] = count
+        return counts
+
     # --- Semantic Search Methods ---
 
     def add_embedding_column(self, table_name: str, embedding_column: str = "embedding") -> EmbeddingColumnResponse:
@@ -618,9 +1024,10 @@ class SQLiteMemoryDatabase:
             # Add embedding column as TEXT (JSON storage)
             with self.get_connection() as conn:
                 conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {embedding_column} TEXT"))
+                self._ensure_embedding_index(conn, table_name, embedding_column)
                 conn.commit()
 
-            self._refresh_metadata()
+            self._reflect_now()
             return {
                 "success": True,
                 "message": f"Added embedding column '{embedding_column}' to table '{table_name}'",
@@ -656,7 +1063,12 @@ class SQLiteMemoryDatabase:
             # Add embedding column if it doesn't exist
             if embedding_column not in table_columns:
                 self.add_embedding_column(table_name, embedding_column)
-                table = self._ensure_table_exists(table_name)  # Refresh
+            else:
+                # Columns added before the partial index existed get it here
+                with self.get_connection() as conn:
+                    self._ensure_embedding_index(conn, table_name, embedding_column)
+                    conn.commit()
+            table = self._ensure_table_exists(table_name)  # Refresh
 
             # Get all rows that need embeddings
             with self.get_connection() as conn:
@@ -670,58 +1082,179 @@ class SQLiteMemoryDatabase:
                 )
                 rows = conn.execute(stmt).fetchall()
 
-                if not rows:
-                    embedding_dim = semantic_engine.get_embedding_dimensions() or 0
-                    return {
-                        "success": True,
-                        "message": "All rows already have embeddings",
-                        "processed": 0,
-                        "model": model_name,
-                        "embedding_dimension": embedding_dim,
-                    }
-
-                processed = 0
-                for i in range(0, len(rows), batch_size):
-                    batch = rows[i: i + batch_size]
-
-                    for row in batch:
-                        row_dict = dict(row._mapping)
-
-                        # Combine text from specified columns
-                        text_parts = []
-                        for col in text_columns:
-                            if col in row_dict and row_dict[col]:
-                                text_parts.append(str(row_dict[col]))
-
-                        if text_parts:
-                            combined_text = " ".join(text_parts)
-
-                            # Generate embedding
-                            embedding = semantic_engine.generate_embedding(combined_text)
-                            embedding_json = json.dumps(embedding)
-
-                            # Update row with embedding
-                            update_stmt = update(table).where(table.c["id"] == row_dict["id"]).values({embedding_column: embedding_json})
-
-                            conn.execute(update_stmt)
-                            processed += 1
-
-                    conn.commit()
-                    logging.info(f"Generated embeddings for batch " f"{i // batch_size + 1}, processed {processed} rows")
-
+            if not rows:
+                embedding_dim = semantic_engine.get_embedding_dimensions() or 0
                 return {
                     "success": True,
-                    "message": f"Generated embeddings for {processed} rows",
-                    "processed": processed,
+                    "message": "All rows already have embeddings",
+                    "processed": 0,
                     "model": model_name,
-                    "embedding_dimension": semantic_engine.get_embedding_dimensions() or 0,
+                    "embedding_dimension": embedding_dim,
                 }
 
+            # One compiled UPDATE, executed once per batch with executemany
+            update_stmt = update(table).where(table.c["id"] == bindparam("row_id")).values({embedding_column: bindparam("embedding_json")})
+
+            processed = 0
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i : i + batch_size]
+
+                # Combine text from specified columns, skipping rows with nothing to embed
+                row_ids = []
+                batch_texts = []
+                for row in batch:
+                    row_dict = dict(row._mapping)
+                    text_parts = [str(row_dict[col]) for col in text_columns if col in row_dict and row_dict[col]]
+                    combined_text = " ".join(text_parts)
+                    if combined_text.strip():
+                        row_ids.append(row_dict["id"])
+                        batch_texts.append(combined_text)
+
+                if batch_texts:
+                    # Encode the whole batch in one call so the model can length-sort
+                    # and pad per mini-batch instead of running one forward pass per row
+                    embeddings = semantic_engine.generate_embeddings_batch(batch_texts)
+
+                    # Encoding happens outside the transaction; the write lock is only
+                    # held for the batch UPDATE, taken up front rather than upgraded mid-batch
+                    with self._write_transaction() as conn:
+                        conn.execute(
+                            update_stmt,
+                            [{"row_id": row_id, "embedding_json": serialize_embedding(embedding)} for row_id, embedding in zip(row_ids, embeddings)],
+                        )
+                    self._mark_table_changed(table_name)
+                    processed += len(row_ids)
+
+                logging.info(f"Generated embeddings for batch " f"{i // batch_size + 1}, processed {processed} rows")
+
+            return {
+                "success": True,
+                "message": f"Generated embeddings for {processed} rows",
+                "processed": processed,
+                "model": model_name,
+                "embedding_dimension": semantic_engine.get_embedding_dimensions() or 0,
+            }
+
         except (ValidationError, SQLAlchemyError) as e:
             if isinstance(e, ValidationError):
                 raise e
             raise DatabaseError(f"Failed to generate embeddings: {str(e)}")
 
+    @staticmethod
+    def _has_embedding(table: Table, embedding_column: str) -> Any:
+        """Condition selecting rows with a stored embedding; matches the partial index."""
+        column = table.c[embedding_column]
+        return and_(column.isnot(None), column != "", column != "null")
+
+    def _ensure_embedding_index(self, conn: Any, table_name: str, embedding_column: str) -> None:
+        """Create a partial index over the rows that have an embedding.
+
+        The index holds only the id key, so scans for embedded rows and the
+        embedded-row count skip unembedded rows without copying the JSON.
+        """
+        if "id" not in self._col_index.get(table_name, {}):
+            return
+        quote = self.engine.dialect.identifier_preparer.quote_identifier
+        column = quote(embedding_column)
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS {quote(f'ix_{table_name}_{embedding_column}_embedded')} ON {quote(table_name)}(id) "
+            f"WHERE {column} IS NOT NULL AND {column} != '' AND {column} != 'null'"
+        )
+
+    def _load_embedding_matrix(self, conn: Any, table: Table, embedding_column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Fetch a table's embeddings and decode them into one unit-length float32 matrix.
+
+        Only rowids and embeddings are read; returns the (N, D) matrix and the
+        aligned int64 rowids. Rows whose embedding cannot be decoded are skipped.
+        Normalising here, once per load, leaves each search a plain dot product.
+        """
+        stmt = self._cached_statement(
+            ("embedding_matrix", table.name, embedding_column),
+            lambda: select(literal_column("rowid"), table.c[embedding_column]).where(self._has_embedding(table, embedding_column)),
+        )
+        rows = conn.execute(stmt).all()
+        matrix, valid_indices = deserialize_embeddings([row[1] for row in rows])
+        rowids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        return normalize_embeddings(matrix), rowids[valid_indices]
+
+    def _cached_embedding_matrix(self, conn: Any, table: Table, embedding_column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return a table's decoded embedding matrix and rowids, reusing them while the table is unchanged.
+
+        Writes through this class bump the table's version, and a COUNT/MAX(rowid)
+        probe catches rows added or removed by other connections. An in-place UPDATE
+        made by another connection or process changes neither, so it is only seen once
+        the entry is evicted: by LRU order, by a write through this class, or by a
+        schema change that triggers re-reflection.
+        """
+        quote = self.engine.dialect.identifier_preparer.quote_identifier
+        count, max_rowid = conn.exec_driver_sql(f"SELECT COUNT(*), MAX(rowid) FROM {quote(table.name)}").one()
+        signature = (self._table_versions.get(table.name, 0), count, max_rowid)
+        key = (table.name, embedding_column)
+
+        with self._embedding_cache_lock:
+            cached = self._embedding_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                self._embedding_cache.move_to_end(key)
+                return cached[1], cached[2]
+
+        matrix, rowids = self._load_embedding_matrix(conn, table, embedding_column)
+
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = (signature, matrix, rowids)
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > EMBEDDING_CACHE_TABLES:
+                self._embedding_cache.popitem(last=False)
+        return matrix, rowids
+
+    def _fetch_rows_by_rowid(self, conn: Any, table: Table, embedding_column: str, rowids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetch rows by rowid, without the embedding column; rows deleted meanwhile are absent."""
+        if not rowids:
+            return {}
+        columns = [column for column in table.c if column.name != embedding_column]
+        stmt = self._cached_statement(
+            ("rows_by_rowid", table.name, embedding_column),
+            lambda: select(literal_column("rowid").label("__rowid"), *columns).where(
+                literal_column("rowid").in_(bindparam("rowids", expanding=True))
+            ),
+        )
+        rows = {}
+        for row in conn.execute(stmt, {"rowids": rowids}):
+            record = dict(row._mapping)
+            rows[record.pop("__rowid")] = record
+        return rows
+
+    def _semantic_search_table(
+        self,
+        semantic_engine: Any,
+        table: Table,
+        query_embedding: List[float],
+        embedding_column: str,
+        similarity_threshold: float,
+        limit: int,
+    ) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Score a single table's embedded rows against the query.
+
+        Returns the scores of the table's best ``limit`` matches above the threshold
+        and the matching rows. Only the embedding matrix and rowids are cached; the
+        rows are fetched fresh by rowid on every call, without the embedding column.
+        """
+        # Check if table has embedding column
+        if embedding_column not in table.c:
+            logging.warning(f"Table '{table.name}' does not have embedding column '{embedding_column}'")
+            return np.zeros(0, dtype=np.float32), []
+
+        # Score the table's embedding matrix, then fetch only the matching rows
+        with self.get_connection() as conn:
+            matrix, rowids = self._cached_embedding_matrix(conn, table, embedding_column)
+            matches = semantic_engine.find_similar_embeddings(query_embedding, matrix, similarity_threshold, limit, normalized=True)
+            match_rowids = [int(rowids[idx]) for idx, _ in matches]
+            rows = self._fetch_rows_by_rowid(conn, table, embedding_column, match_rowids)
+
+        # A row deleted since the matrix was checked is dropped with its score
+        kept = [(score, rows[rowid]) for rowid, (_, score) in zip(match_rowids, matches) if rowid in rows]
+        scores = np.fromiter((score for score, _ in kept), dtype=np.float32, count=len(kept))
+        return scores, [row for _, row in kept]
+
     def semantic_search(
         self,
         query: str,
@@ -744,66 +1277,47 @@ class SQLiteMemoryDatabase:
             search_tables = tables or list(self.metadata.tables.keys())
             semantic_engine = get_semantic_engine(model_name)
 
-            all_results = []
-
-            with self.get_connection() as conn:
-                for table_name in search_tables:
-                    if table_name not in self.metadata.tables:
-                        continue
-
-                    table = self.metadata.tables[table_name]
-
-                    # Check if table has embedding column
-                    if embedding_column not in [col.name for col in table.columns]:
-                        logging.warning(f"Table '{table_name}' does not have embedding column '{embedding_column}'")
-                        continue
-
-                    # Get all rows with embeddings
-                    stmt = select(table).where(
-                        and_(
-                            table.c[embedding_column].isnot(None),
-                            table.c[embedding_column] != "",
-                            table.c[embedding_column] != "null",
-                        )
-                    )
-                    rows = conn.execute(stmt).fetchall()
+            searchable_tables = [name for name in search_tables if name in self.metadata.tables]
 
-                    if not rows:
-                        continue
+            # Encode the query once and score every table against it
+            query_embedding = semantic_engine.generate_embedding(query)
 
-                    # Convert to list of dicts for semantic search
-                    content_data = [dict(row._mapping) for row in rows]
-
-                    # Determine text columns for highlighting
-                    if text_columns is None:
-                        text_cols = [col.name for col in table.columns if "TEXT" in str(col.type).upper() or "VARCHAR" in str(col.type).upper()]
-                    else:
-                        text_cols = text_columns
-
-                    # Perform semantic search on this table
-                    table_results = semantic_engine.semantic_search(
-                        query,
-                        content_data,
-                        embedding_column,
-                        text_cols,
-                        similarity_threshold,
-                        limit * 2,  # Get more for global ranking
-                    )
-
-                    # Add table name to results
-                    for result in table_results:
-                        result["table_name"] = table_name
-
-                    all_results.extend(table_results)
-
-            # Sort all results by similarity score and limit
-            all_results.sort(key=lambda x: x.get("similarity_score", 0), reverse=True)
-            final_results = all_results[:limit]
+            def search_table(table_name: str) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+                return self._semantic_search_table(
+                    semantic_engine,
+                    self.metadata.tables[table_name],
+                    query_embedding,
+                    embedding_column,
+                    similarity_threshold,
+                    limit,
+                )
 
-            # Remove embedding data from results to keep LLM responses clean
-            for result in final_results:
-                if embedding_column in result:
-                    del result[embedding_column]
+            # Tables are independent, so load and score them concurrently.
+            # Each worker checks out its own pooled connection; an in-memory
+            # database has only one connection, so it is searched serially.
+            if len(searchable_tables) > 1 and not self._in_memory:
+                with ThreadPoolExecutor(max_workers=min(SEMANTIC_SEARCH_WORKERS, len(searchable_tables))) as executor:
+                    per_table_results = list(executor.map(search_table, searchable_tables))
+            else:
+                per_table_results = [search_table(name) for name in searchable_tables]
+
+            # Every global top match is among its own table's top matches, so one
+            # top-k over the per-table scores ranks all tables; result rows are only
+            # built for the survivors
+            scores = np.concatenate([table_scores for table_scores, _ in per_table_results]) if per_table_results else np.zeros(0)
+            candidates = [(table_name, row) for table_name, (_, rows) in zip(searchable_tables, per_table_results) for row in rows]
+            top = np.arange(len(scores))
+            if 0 < limit < len(scores):
+                top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top], kind="stable")][: max(limit, 0)]
+
+            final_results = []
+            for idx in top:
+                table_name, row = candidates[idx]
+                text_cols = self._text_columns.get(table_name, []) if text_columns is None else text_columns
+                result = semantic_engine.build_search_result(row, scores[idx], query, embedding_column, text_cols)
+                result["table_name"] = table_name
+                final_results.append(result)
 
             return {
                 "success": True,
@@ -837,35 +1351,37 @@ class SQLiteMemoryDatabase:
             table = self._ensure_table_exists(table_name)
             semantic_engine = get_semantic_engine(model_name)
 
+            if embedding_column not in table.c:
+                raise ValidationError(f"Row {row_id} does not have an embedding")
+
             with self.get_connection() as conn:
-                # Get the target row
-                target_stmt = select(table).where(table.c["id"] == row_id)
-                target_row = conn.execute(target_stmt).fetchone()
+                # Get the target row, without its embedding; the vector comes from the matrix
+                target_stmt = self._cached_statement(
+                    ("related_target", table_name, embedding_column),
+                    lambda: select(
+                        literal_column("rowid").label("__rowid"), *[column for column in table.c if column.name != embedding_column]
+                    ).where(table.c["id"] == bindparam("row_id")),
+                )
+                target_row = conn.execute(target_stmt, {"row_id": row_id}).fetchone()
 
                 if not target_row:
                     raise ValidationError(f"Row with id {row_id} not found in table '{table_name}'")
 
                 target_dict = dict(target_row._mapping)
+                target_rowid = target_dict.pop("__rowid")
 
-                # Check if target has embedding
-                if embedding_column not in target_dict or not target_dict[embedding_column] or target_dict[embedding_column] in ["", "null"]:
-                    raise ValidationError(f"Row {row_id} does not have an embedding")
-
-                # Get target embedding
-                target_embedding = json.loads(target_dict[embedding_column])
+                # Score the table's cached embedding matrix; the target row is in it
+                # too, so it supplies the query vector and is dropped from the matches
+                candidate_matrix, rowids = self._cached_embedding_matrix(conn, table, embedding_column)
+                target_indices = np.flatnonzero(rowids == target_rowid)
 
-                # Get all other rows with embeddings
-                stmt = select(table).where(
-                    and_(
-                        table.c["id"] != row_id,
-                        table.c[embedding_column].isnot(None),
-                        table.c[embedding_column] != "",
-                        table.c[embedding_column] != "null",
-                    )
-                )
-                rows = conn.execute(stmt).fetchall()
+                # Rows without a stored (or decodable) embedding are not in the matrix
+                if len(target_indices) == 0:
+                    raise ValidationError(f"Row {row_id} does not have an embedding")
+                target_embedding = candidate_matrix[target_indices[0]]
+                target_indices = set(target_indices.tolist())
 
-                if not rows:
+                if len(rowids) == len(target_indices):
                     return {
                         "success": True,
                         "results": [],
@@ -876,55 +1392,25 @@ class SQLiteMemoryDatabase:
                         "message": "No other rows with embeddings found",
                     }
 
-                # Find similar rows
-                content_data = [dict(row._mapping) for row in rows]
-                candidate_embeddings = []
-                valid_indices = []
-
-                for idx, row_dict in enumerate(content_data):
-                    try:
-                        embedding = json.loads(row_dict[embedding_column])
-                        candidate_embeddings.append(embedding)
-                        valid_indices.append(idx)
-                    except json.JSONDecodeError:
-                        continue
-
-                if not candidate_embeddings:
-                    return {
-                        "success": True,
-                        "results": [],
-                        "target_row": target_dict,
-                        "total_results": 0,
-                        "similarity_threshold": similarity_threshold,
-                        "model": model_name,
-                        "message": "No valid embeddings found for comparison",
-                    }
-
                 # Calculate similarities
-                similar_indices = semantic_engine.find_similar_embeddings(target_embedding, candidate_embeddings, similarity_threshold, limit)
+                similar_indices = semantic_engine.find_similar_embeddings(
+                    target_embedding, candidate_matrix, similarity_threshold, limit + len(target_indices), normalized=True
+                )
 
-                # Build results
+                # Build results from the matching rows only, fetched without their embeddings
+                matches = [(int(rowids[idx]), score) for idx, score in similar_indices if idx not in target_indices][:limit]
+                rows = self._fetch_rows_by_rowid(conn, table, embedding_column, [rowid for rowid, _ in matches])
+                # The fetched rows are fresh dicts, so the score is set on them directly
                 results = []
-                for candidate_idx, similarity_score in similar_indices:
-                    original_idx = valid_indices[candidate_idx]
-                    row_dict = content_data[original_idx].copy()
-
-                    # Remove embedding data to avoid polluting LLM responses
-                    if embedding_column in row_dict:
-                        del row_dict[embedding_column]
-
-                    row_dict["similarity_score"] = round(similarity_score, 3)
-                    results.append(row_dict)
-
-                # Remove embedding from target_row as well
-                target_dict_clean = target_dict.copy()
-                if embedding_column in target_dict_clean:
-                    del target_dict_clean[embedding_column]
+                for rowid, similarity_score in matches:
+                    if rowid in rows:
+                        rows[rowid]["similarity_score"] = round(similarity_score, 3)
+                        results.append(rows[rowid])
 
                 return {
                     "success": True,
                     "results": results,
-                    "target_row": target_dict_clean,
+                    "target_row": target_dict,
                     "total_results": len(results),
                     "similarity_threshold": similarity_threshold,
                     "model": model_name,
@@ -1066,46 +1552,24 @@ class SQLiteMemoryDatabase:
                 }
 
             with self.get_connection() as conn:
-                # Count total rows
-                total_count = conn.execute(select(text("COUNT(*)")).select_from(table)).scalar() or 0
-
-                # Count rows with embeddings
-                embedded_count = (
-                    conn.execute(
-                        select(text("COUNT(*)"))
-                        .select_from(table)
-                        .where(
-                            and_(
-                                table.c[embedding_column].isnot(None),
-                                table.c[embedding_column] != "",
-                                table.c[embedding_column] != "null",
-                            )
-                        )
-                    ).scalar()
-                    or 0
-                )
-
-                # Get sample embedding to check dimensions
-                sample_stmt = (
-                    select(table.c[embedding_column])
-                    .where(
-                        and_(
-                            table.c[embedding_column].isnot(None),
-                            table.c[embedding_column] != "",
-                            table.c[embedding_column] != "null",
-                        )
+                # Total rows, rows with embeddings and a sample embedding (for its
+                # dimensions) in one statement; each subquery keeps its own plan, so
+                # the embedded-row count and sample still use the partial index
+                def build_stats() -> Any:
+                    has_embedding = self._has_embedding(table, embedding_column)
+                    return select(
+                        select(text("COUNT(*)")).select_from(table).scalar_subquery(),
+                        select(text("COUNT(*)")).select_from(table).where(has_embedding).scalar_subquery(),
+                        select(table.c[embedding_column]).where(has_embedding).limit(1).scalar_subquery(),
                     )
-                    .limit(1)
-                )
 
-                sample_result = conn.execute(sample_stmt).fetchone()
-                dimensions = None
-                if sample_result and sample_result[0]:
-                    try:
-                        sample_embedding = json.loads(sample_result[0])
-                        dimensions = len(sample_embedding)
-                    except json.JSONDecodeError:
-                        pass
+                stats_stmt = self._cached_statement(("embedding_stats", table_name, embedding_column), build_stats)
+                total_count, embedded_count, sample = conn.execute(stats_stmt).one()
+                total_count = total_count or 0
+                embedded_count = embedded_count or 0
+
+                sample_matrix, _ = deserialize_embeddings([sample] if sample else [])
+                dimensions = sample_matrix.shape[1] if len(sample_matrix) else None
 
                 coverage_percent = (embedded_count / total_count * 100) if total_count > 0 else 0.0
 
@@ -1137,7 +1601,9 @@ def get_database(db_path: Optional[str] = None) -> SQLiteMemoryDatabase:
     if actual_path is None:
         actual_path = "./test.db"
 
-    if _db_instance is None or (db_path and db_path != _db_instance.db_path):
+    # Compare absolute paths: the instance stores one, so a relative path would
+    # otherwise never match and the engine would be rebuilt on every call
+    if _db_instance is None or (db_path and _resolve_db_path(db_path) != _db_instance.db_path):
         # Close previous instance if it exists
         if _db_instance is not None:
             _db_instance.close()
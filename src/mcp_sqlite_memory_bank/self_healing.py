@@ -14,6 +14,8 @@ import sqlite3
 import shutil
 from datetime import datetime
 
+from .database import is_internal_table
+
 
 class DependencyChecker:
     """Automatic dependency checking and installation guidance."""
@@ -137,21 +139,19 @@ class DatabaseDiagnostic:
                     diagnostics["backup_recommended"] = True
                     diagnostics["repair_suggestions"].append("Consider running database repair or creating backup")
 
-                # Count tables and rows
+                # Count user tables and rows; search index tables are bookkeeping
                 cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = cursor.fetchall()
+                tables = [row[0] for row in cursor.fetchall() if not is_internal_table(row[0])]
                 diagnostics["table_count"] = len(tables)
 
                 total_rows = 0
-                for table in tables:
-                    table_name = table[0]
-                    if not table_name.startswith("sqlite_"):
-                        try:
-                            cursor = conn.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-                            count = cursor.fetchone()[0]
-                            total_rows += count
-                        except sqlite3.Error:
-                            pass
+                for table_name in tables:
+                    try:
+                        cursor = conn.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+                        count = cursor.fetchone()[0]
+                        total_rows += count
+                    except sqlite3.Error:
+                        pass
 
                 diagnostics["total_rows"] = total_rows
 
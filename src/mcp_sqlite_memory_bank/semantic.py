@@ -7,9 +7,14 @@ to enhance the memory bank's knowledge discovery features.
 Author: Robert Meisner
 """
 
+import hashlib
+import heapq
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union, cast
 import numpy as np
 
 # Optional imports with graceful fallback
@@ -32,8 +37,58 @@ except ImportError:
     torch = None  # type: ignore
     logging.warning("torch not available. Install with: pip install torch")
 
+try:
+    import orjson
+except ImportError:
+    # Optional: stdlib json decodes the same embeddings, only slower
+    orjson = None  # type: ignore
+
 from .types import ValidationError, DatabaseError
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either as the latter
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """Scale embedding vectors (rows of a matrix) to unit length; zero vectors stay zero."""
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.where(norms > 0, norms, 1.0).astype(embeddings.dtype)
+
+
+def serialize_embedding(embedding: List[float]) -> str:
+    """Encode an embedding as compact JSON text for storage in an embedding column.
+
+    Each component is written as the shortest text that round-trips its float32
+    value, so precision is relative to its magnitude and small components stay
+    exact, in about half the text of the double repr.
+    """
+    return "[" + ",".join(map(str, np.asarray(embedding, dtype=np.float32))) + "]"
+
+
+def deserialize_embeddings(values: Sequence[Any]) -> Tuple[np.ndarray, List[int]]:
+    """
+    Decode stored embeddings (JSON text or lists) into one float32 matrix.
+
+    Returns the (N, D) matrix and the positions in values of its rows; values
+    that cannot be decoded are logged and skipped.
+    """
+    parsed = []
+    valid_indices = []
+    for idx, value in enumerate(values):
+        try:
+            parsed.append(_json_loads(value) if isinstance(value, str) else value)
+            valid_indices.append(idx)
+        except (json.JSONDecodeError, TypeError) as e:
+            logging.warning(f"Invalid embedding data in row {idx}: {e}")
+
+    if not parsed:
+        return np.zeros((0, 0), dtype=np.float32), []
+
+    try:
+        return np.asarray(parsed, dtype=np.float32), valid_indices
+    except ValueError as e:
+        raise DatabaseError(f"Inconsistent embedding data: {e}")
+
 
 class SemanticSearchEngine:
     """
@@ -46,11 +101,16 @@ class SemanticSearchEngine:
     - Caching for performance
     """
 
+    # Maximum number of text embeddings kept in the LRU cache
+    cache_size = 1024
+
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         """Initialize the semantic search engine."""
         self.model_name = model_name
         self._model = None
-        self._embedding_cache: Dict[str, Any] = {}
+        self._model_lock = threading.Lock()
+        self._embedding_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ValueError("sentence-transformers is not available. Please install with: pip install sentence-transformers")
@@ -59,19 +119,42 @@ class SemanticSearchEngine:
     def model(self) -> Any:
         """Lazy load the sentence transformer model."""
         if self._model is None:
-            if not SENTENCE_TRANSFORMERS_AVAILABLE or SentenceTransformer is None:
-                raise ValueError("sentence-transformers is not available")
-            try:
-                self._model = SentenceTransformer(self.model_name)
-                logging.info(f"Loaded semantic search model: {self.model_name}")
-            except Exception as e:
-                raise DatabaseError(f"Failed to load semantic search model {self.model_name}: {e}")
+            with self._model_lock:
+                if self._model is None:
+                    if not SENTENCE_TRANSFORMERS_AVAILABLE or SentenceTransformer is None:
+                        raise ValueError("sentence-transformers is not available")
+                    try:
+                        self._model = SentenceTransformer(self.model_name)
+                        logging.info(f"Loaded semantic search model: {self.model_name}")
+                    except Exception as e:
+                        raise DatabaseError(f"Failed to load semantic search model {self.model_name}: {e}")
         return self._model
 
     def get_embedding_dimensions(self) -> Optional[int]:
         """Get the embedding dimension size for the current model."""
         return self.model.get_sentence_embedding_dimension()
 
+    @staticmethod
+    def _cache_key(text: str) -> bytes:
+        """Stable digest of a text, used as the embedding cache key."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _get_cached(self, key: bytes) -> Optional[List[float]]:
+        """Look up a cached embedding and mark it as recently used."""
+        with self._cache_lock:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+            return embedding
+
+    def _store_cached(self, key: bytes, embedding: List[float]) -> None:
+        """Cache an embedding, evicting the least recently used entries."""
+        with self._cache_lock:
+            self._embedding_cache[key] = embedding
+            self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > self.cache_size:
+                self._embedding_cache.popitem(last=False)
+
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -86,9 +169,10 @@ class SemanticSearchEngine:
             raise ValidationError("Text cannot be empty for embedding generation")
 
         # Check cache first
-        cache_key = f"{self.model_name}:{hash(text)}"
-        if cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
+        cache_key = self._cache_key(text)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             # Generate embedding
@@ -96,7 +180,7 @@ class SemanticSearchEngine:
             embedding_list = embedding.tolist()
 
             # Cache for future use
-            self._embedding_cache[cache_key] = embedding_list
+            self._store_cached(cache_key, embedding_list)
 
             return embedding_list
         except Exception as e:
@@ -120,13 +204,30 @@ class SemanticSearchEngine:
         if not valid_texts:
             raise ValidationError("No valid texts provided for embedding generation")
 
+        # Only texts missing from the cache are sent to the model
+        keys = [self._cache_key(text) for text in valid_texts]
+        results: List[Optional[List[float]]] = [self._get_cached(key) for key in keys]
+        missing: Dict[bytes, List[int]] = {}
+        for idx, (key, cached) in enumerate(zip(keys, results)):
+            if cached is None:
+                missing.setdefault(key, []).append(idx)
+
+        if not missing:
+            return cast(List[List[float]], results)
+
         try:
+            missing_texts = [valid_texts[indices[0]] for indices in missing.values()]
             embeddings = self.model.encode(
-                valid_texts,
+                missing_texts,
                 convert_to_tensor=False,
-                show_progress_bar=len(valid_texts) > 10,
+                show_progress_bar=len(missing_texts) > 10,
             )
-            return [emb.tolist() for emb in embeddings]
+            for (key, indices), emb in zip(missing.items(), embeddings):
+                embedding_list = emb.tolist()
+                self._store_cached(key, embedding_list)
+                for idx in indices:
+                    results[idx] = embedding_list
+            return cast(List[List[float]], results)
         except Exception as e:
             raise DatabaseError(f"Failed to generate batch embeddings: {e}")
 
@@ -170,61 +271,72 @@ class SemanticSearchEngine:
         except Exception as e:
             raise DatabaseError(f"Failed to calculate similarity: {e}")
 
+    def score_embeddings(
+        self,
+        query_embedding: List[float],
+        candidate_embeddings: Union[List[List[float]], np.ndarray],
+        normalized: bool = False,
+    ) -> np.ndarray:
+        """
+        Calculate the cosine similarity of every candidate to the query in one pass.
+
+        Callers comparing several thresholds can score once and filter the
+        returned array instead of repeating the search.
+
+        Args:
+            query_embedding: Query vector
+            candidate_embeddings: List of candidate vectors, or an (N, D) matrix
+            normalized: Candidates are already a unit-length float32 matrix, so
+                cosine similarity is their dot product with the query
+
+        Returns:
+            float32 array of similarity scores, aligned with candidate_embeddings
+        """
+        if len(candidate_embeddings) == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        try:
+            # Normalise once so cosine similarity is a single float32 matrix-vector product
+            query = normalize_embeddings(np.asarray(query_embedding, dtype=np.float32))
+            candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+            if not normalized:
+                candidates = normalize_embeddings(candidates)
+            return candidates @ query
+        except ValueError as e:
+            raise DatabaseError(f"Failed to calculate similarity: {e}")
+
     def find_similar_embeddings(
         self,
         query_embedding: List[float],
-        candidate_embeddings: List[List[float]],
+        candidate_embeddings: Union[List[List[float]], np.ndarray],
         similarity_threshold: float = 0.5,
         top_k: int = 10,
+        normalized: bool = False,
     ) -> List[Tuple[int, float]]:
         """
         Find the most similar embeddings to a query embedding.
 
         Args:
             query_embedding: Query vector
-            candidate_embeddings: List of candidate vectors
+            candidate_embeddings: List of candidate vectors, or an (N, D) matrix
             similarity_threshold: Minimum similarity score
             top_k: Maximum number of results
+            normalized: Candidates are already a unit-length float32 matrix
 
         Returns:
             List of (index, similarity_score) tuples, sorted by similarity descending
         """
-        if not candidate_embeddings:
+        if len(candidate_embeddings) == 0:
             return []
 
-        # Use efficient torch/sentence-transformers if available
-        if TORCH_AVAILABLE and torch is not None and SENTENCE_TRANSFORMERS_AVAILABLE and util is not None:
-            try:
-                # Convert to tensors
-                query_tensor = torch.tensor(query_embedding).unsqueeze(0)
-                candidate_tensor = torch.tensor(candidate_embeddings)
-
-                # Calculate similarities
-                similarities = util.cos_sim(query_tensor, candidate_tensor)[0]
-
-                # Find matches above threshold
-                results = []
-                for idx, sim in enumerate(similarities):
-                    sim_score = sim.item()
-                    if sim_score >= similarity_threshold:
-                        results.append((idx, sim_score))
-
-                # Sort by similarity descending and limit to top_k
-                results.sort(key=lambda x: x[1], reverse=True)
-                return results[:top_k]
-            except Exception as e:
-                logging.warning(f"Torch similarity search failed, using numpy fallback: {e}")
-
-        # Fallback to numpy implementation
-        results = []
-        for idx, candidate_emb in enumerate(candidate_embeddings):
-            similarity = self.calculate_similarity(query_embedding, candidate_emb)
-            if similarity >= similarity_threshold:
-                results.append((idx, similarity))
-
-        # Sort by similarity descending and limit to top_k
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        similarities = self.score_embeddings(query_embedding, candidate_embeddings, normalized)
+
+        # Keep matches above threshold; partition out the top_k before sorting only those
+        matches = np.flatnonzero(similarities >= similarity_threshold)
+        if 0 < top_k < len(matches):
+            matches = matches[np.argpartition(-similarities[matches], top_k - 1)[:top_k]]
+        matches = matches[np.argsort(-similarities[matches], kind="stable")][: max(top_k, 0)]
+        return [(int(idx), float(similarities[idx])) for idx in matches]
 
     def semantic_search(
         self,
@@ -234,6 +346,7 @@ class SemanticSearchEngine:
         content_columns: Optional[List[str]] = None,
         similarity_threshold: float = 0.5,
         top_k: int = 10,
+        embeddings: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic search on content data.
@@ -245,6 +358,8 @@ class SemanticSearchEngine:
             content_columns: Columns to search in (for highlighting)
             similarity_threshold: Minimum similarity score
             top_k: Maximum number of results
+            embeddings: Already decoded (N, D) matrix aligned with content_data; the
+                rows then need not carry the embedding column
 
         Returns:
             List of search results with similarity scores
@@ -259,59 +374,67 @@ class SemanticSearchEngine:
             # Generate query embedding
             query_embedding = self.generate_embedding(query)
 
-            # Extract embeddings from content data
-            candidate_embeddings = []
-            valid_indices = []
+            # Extract embeddings from content data unless the caller already decoded them
+            if embeddings is not None:
+                candidate_embeddings = embeddings
+                valid_indices = list(range(len(content_data)))
+            else:
+                embedded_indices = [idx for idx, row in enumerate(content_data) if row.get(embedding_column)]
+                candidate_embeddings, decoded = deserialize_embeddings([content_data[idx][embedding_column] for idx in embedded_indices])
+                valid_indices = [embedded_indices[idx] for idx in decoded]
 
-            for idx, row in enumerate(content_data):
-                if embedding_column in row and row[embedding_column]:
-                    try:
-                        # Parse embedding from JSON string or use directly if already a
-                        # list
-                        embedding = row[embedding_column]
-                        if isinstance(embedding, str):
-                            embedding = json.loads(embedding)
-
-                        candidate_embeddings.append(embedding)
-                        valid_indices.append(idx)
-                    except (json.JSONDecodeError, TypeError) as e:
-                        logging.warning(f"Invalid embedding data in row {idx}: {e}")
-                        continue
-
-            if not candidate_embeddings:
+            if len(candidate_embeddings) == 0:
                 return []
 
             # Find similar embeddings
             similar_indices = self.find_similar_embeddings(query_embedding, candidate_embeddings, similarity_threshold, top_k)
 
             # Build results
-            results = []
-            for candidate_idx, similarity_score in similar_indices:
-                original_idx = valid_indices[candidate_idx]
-                row = content_data[original_idx].copy()
+            return [
+                self.build_search_result(content_data[valid_indices[candidate_idx]], similarity_score, query, embedding_column, content_columns)
+                for candidate_idx, similarity_score in similar_indices
+            ]
 
-                # Remove embedding data to avoid polluting LLM responses
-                if embedding_column in row:
-                    del row[embedding_column]
+        except Exception as e:
+            raise DatabaseError(f"Semantic search failed: {e}")
 
-                # Add similarity score
-                row["similarity_score"] = round(similarity_score, 3)
+    def build_search_result(
+        self,
+        row: Dict[str, Any],
+        similarity_score: float,
+        query: str,
+        embedding_column: str = "embedding",
+        content_columns: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build one search result from a matched row, leaving the row itself unchanged.
 
-                # Add matched content highlighting if specified
-                if content_columns:
-                    matched_content = []
-                    for col in content_columns:
-                        if col in row and row[col] and query.lower() in str(row[col]).lower():
-                            matched_content.append(f"{col}: {row[col]}")
-                    if matched_content:
-                        row["matched_content"] = matched_content
+        Args:
+            row: Matched row
+            similarity_score: Similarity of the row to the query
+            query: Natural language search query
+            embedding_column: Column name containing embeddings
+            content_columns: Columns to search in (for highlighting)
 
-                results.append(row)
+        Returns:
+            Copy of the row without its embedding, with score and highlighting
+        """
+        result = row.copy()
 
-            return results
+        # Remove embedding data to avoid polluting LLM responses
+        result.pop(embedding_column, None)
 
-        except Exception as e:
-            raise DatabaseError(f"Semantic search failed: {e}")
+        # Add similarity score
+        result["similarity_score"] = round(float(similarity_score), 3)
+
+        # Add matched content highlighting if specified
+        if content_columns:
+            query_lower = query.lower()
+            matched_content = [f"{col}: {result[col]}" for col in content_columns if result.get(col) and query_lower in str(result[col]).lower()]
+            if matched_content:
+                result["matched_content"] = matched_content
+
+        return result
 
     def hybrid_search(
         self,
@@ -370,19 +493,19 @@ class SemanticSearchEngine:
             result["combined_score"] = round(combined_score, 3)
             result["text_score"] = round(text_score, 3)
 
-        # Sort by combined score
-        semantic_results.sort(key=lambda x: x.get("combined_score", 0), reverse=True)
-
-        return semantic_results[:top_k]
+        # Keep the top_k by combined score
+        return heapq.nlargest(max(top_k, 0), semantic_results, key=itemgetter("combined_score"))
 
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self._embedding_cache.clear()
+        with self._cache_lock:
+            self._embedding_cache.clear()
         logging.info("Semantic search cache cleared")
 
 
 # Global instance
 _semantic_engine: Optional[SemanticSearchEngine] = None
+_semantic_engine_lock = threading.Lock()
 
 
 def get_semantic_engine(model_name: str = "all-MiniLM-L6-v2") -> SemanticSearchEngine:
@@ -390,21 +513,33 @@ def get_semantic_engine(model_name: str = "all-MiniLM-L6-v2") -> SemanticSearchE
     global _semantic_engine
 
     try:
-        if _semantic_engine is None or _semantic_engine.model_name != model_name:
-            if not SENTENCE_TRANSFORMERS_AVAILABLE:
-                raise ValueError("Sentence transformers not available for semantic search")
-            _semantic_engine = SemanticSearchEngine(model_name)
+        engine = _semantic_engine
+        if engine is None or engine.model_name != model_name:
+            with _semantic_engine_lock:
+                if _semantic_engine is None or _semantic_engine.model_name != model_name:
+                    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                        raise ValueError("Sentence transformers not available for semantic search")
+                    _semantic_engine = SemanticSearchEngine(model_name)
+                engine = _semantic_engine
 
         # Verify the engine is properly initialized
-        if not hasattr(_semantic_engine, "hybrid_search"):
+        if not hasattr(engine, "hybrid_search"):
             raise ValueError("Semantic engine missing hybrid_search method")
 
-        return _semantic_engine
+        return engine
 
     except Exception as e:
         raise DatabaseError(f"Failed to initialize semantic engine: {e}")
 
 
+def reset_semantic_cache() -> None:
+    """Drop the global semantic engine along with its loaded model and embedding cache."""
+    global _semantic_engine
+
+    with _semantic_engine_lock:
+        _semantic_engine = None
+
+
 def is_semantic_search_available() -> bool:
     """Check if semantic search is available."""
     return SENTENCE_TRANSFORMERS_AVAILABLE
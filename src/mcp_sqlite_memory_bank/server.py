@@ -54,6 +54,7 @@ from .tools.visualization import (
 from .tools.search import (
     search_content as search_content_impl,
     explore_tables as explore_tables_impl,
+    create_search_index as create_search_index_impl,
     add_embeddings as add_embeddings_impl,
     auto_semantic_search as auto_semantic_search_impl,
     auto_smart_search as auto_smart_search_impl,
@@ -474,6 +475,7 @@ def search_content(
     query: str,
     tables: Optional[List[str]] = None,
     limit: int = 50,
+    prefix: bool = False,
 ) -> ToolResponse:
     """
     Perform full-text search across table content using natural language queries.
@@ -482,6 +484,7 @@ def search_content(
         query (str): Search query (supports natural language, keywords, phrases)
         tables (Optional[List[str]]): Specific tables to search (default: all tables)
         limit (int): Maximum number of results to return (default: 50)
+        prefix (bool): Only match values that start with the query (default: False)
 
     Returns:
         ToolResponse: On success: {"success": True, "results": List[SearchResult]}
@@ -496,12 +499,38 @@ def search_content(
 
     FastMCP Tool Info:
         - Searches all text columns across specified tables
-        - Uses SQLite FTS for fast full-text search
+        - Uses the FTS5 index from create_search_index when present, else a LIKE scan
         - Returns results ranked by relevance
         - Supports phrase search with quotes: "exact phrase"
         - Supports boolean operators: AND, OR, NOT
     """
-    return search_content_impl(query, tables, limit)
+    return search_content_impl(query, tables, limit, prefix)
+
+
+@mcp.tool
+@catch_errors
+def create_search_index(table_name: str) -> ToolResponse:
+    """
+    Build a full-text index that speeds up search_content on a table.
+
+    Args:
+        table_name (str): Table whose text columns should be indexed
+
+    Returns:
+        ToolResponse: On success: {"success": True, "message": str, "columns": List[str]}
+                     On error: {"success": False, "error": str, "category": str, "details": dict}
+
+    Examples:
+        >>> create_search_index("notes")
+        {"success": True, "message": "Search index ready for table 'notes'", "columns": ["title", "body"]}
+
+    FastMCP Tool Info:
+        - Opt-in: search_content works without it, using a slower LIKE scan
+        - Requires an INTEGER PRIMARY KEY and SQLite's FTS5 trigram tokenizer
+        - Kept in sync by triggers, so every later write to the table also updates it
+        - Run again after adding text columns to include them
+    """
+    return create_search_index_impl(table_name)
 
 
 @mcp.tool
@@ -1310,8 +1339,9 @@ def batch_create_memories(
     """
     🚀 **BATCH MEMORY CREATION** - Efficiently add multiple memories at once!
 
-    Create multiple memory records in a single operation with optional duplicate prevention.
-    Much faster than creating records one by one.
+    Create multiple memory records in a single transaction with optional duplicate prevention.
+    Much faster than creating records one by one. The batch is all-or-nothing: if any
+    record fails, none are written.
 
     Args:
         table_name (str): Table to insert records into
@@ -1320,7 +1350,7 @@ def batch_create_memories(
         use_upsert (bool): Whether to use upsert logic to prevent duplicates (default: True)
 
     Returns:
-        ToolResponse: On success: {"success": True, "created": int, "updated": int, "failed": int}
+        ToolResponse: On success: {"success": True, "created": int, "updated": int, "results": List}
                      On error: {"success": False, "error": str, "category": str, "details": dict}
 
     Examples:
@@ -1329,13 +1359,13 @@ def batch_create_memories(
         ...     {'decision_name': 'Database Choice', 'chosen_approach': 'SQLite'},
         ...     {'decision_name': 'Frontend Framework', 'chosen_approach': 'React'}
         ... ], match_columns=['decision_name'])
-        {"success": True, "created": 2, "updated": 1, "failed": 0, "total_processed": 3}
+        {"success": True, "created": 2, "updated": 1, "total_processed": 3, ...}
 
     FastMCP Tool Info:
         - **EFFICIENT**: Process multiple records in one operation
         - **SMART DEDUPLICATION**: Optional upsert logic prevents duplicates
-        - **DETAILED FEEDBACK**: Returns counts for created, updated, and failed records
-        - **PARTIAL SUCCESS**: Continues processing even if some records fail
+        - **DETAILED FEEDBACK**: Returns counts and per-record ids for created and updated records
+        - **ALL-OR-NOTHING**: One invalid record rolls back the whole batch
         - **PERFECT FOR BULK IMPORTS**: Ideal for importing knowledge bases or datasets
     """
     return basic.batch_create_memories(table_name, data_list, match_columns, use_upsert)
@@ -17,6 +17,7 @@ from .analytics import (
 from .search import (
     search_content,
     explore_tables,
+    create_search_index,
     add_embeddings,
     semantic_search,
     find_related,
@@ -62,6 +63,7 @@ __all__ = [
     # Search tools
     "search_content",
     "explore_tables",
+    "create_search_index",
     "add_embeddings",
     "semantic_search",
     "find_related",
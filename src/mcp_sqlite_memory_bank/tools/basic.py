@@ -141,10 +141,9 @@ def upsert_memory(table_name: str, data: Dict[str, Any], match_columns: List[str
         ToolResponse: For updates: {"success": True, "action": "updated", "id": rowid, "updated_fields": {...}}
                      For creates: {"success": True, "action": "created", "id": rowid}
     """
-    import os
+    from .. import server
 
-    db_path = os.environ.get("DB_PATH", "./test.db")
-    db = get_database(db_path)
+    db = get_database(server.DB_PATH)
 
     try:
         # Build WHERE clause for matching
@@ -224,7 +223,8 @@ def batch_create_memories(
     🚀 **TRANSACTION-SAFE BATCH MEMORY CREATION** - All succeed or all fail!
 
     Efficiently create multiple memory records in a single transaction with rollback protection.
-    Supports both batch insert (fast) and batch upsert (prevents duplicates).
+    Supports both batch insert (fast) and batch upsert (prevents duplicates). If any record
+    fails, no record is written and the response is an error.
 
     Args:
         table_name (str): Table to insert records into
@@ -233,7 +233,7 @@ def batch_create_memories(
         use_upsert (bool): Whether to use upsert logic to prevent duplicates (default: True)
 
     Returns:
-        ToolResponse: {"success": True, "created": int, "updated": int, "failed": int, "results": List}
+        ToolResponse: {"success": True, "created": int, "updated": int, "results": List}
     """
     if not data_list:
         return cast(
@@ -242,101 +242,35 @@ def batch_create_memories(
                 "success": True,
                 "created": 0,
                 "updated": 0,
-                "failed": 0,
                 "results": [],
                 "message": "No data provided",
             },
         )
 
-    import os
+    from .. import server
 
-    db_path = os.environ.get("DB_PATH", "./test.db")
-    db = get_database(db_path)
+    db = get_database(server.DB_PATH)
 
     created_count = 0
     updated_count = 0
-    failed_count = 0
     results = []
 
     # Transaction-safe batch processing with rollback
     try:
-        with db.get_connection() as conn:
-            # Start transaction
-            trans = conn.begin()
-
-            try:
-                for i, data in enumerate(data_list):
-                    try:
-                        if use_upsert and match_columns:
-                            # Use upsert logic to prevent duplicates
-                            result = upsert_memory(table_name, data, match_columns)
-                            if result.get("success"):
-                                action = result.get("action", "unknown")
-                                if action == "created":
-                                    created_count += 1
-                                elif action == "updated":
-                                    updated_count += 1
-                                results.append(
-                                    {
-                                        "index": i,
-                                        "action": action,
-                                        "id": result.get("id"),
-                                        "success": True,
-                                    }
-                                )
-                            else:
-                                failed_count += 1
-                                results.append(
-                                    {
-                                        "index": i,
-                                        "action": "failed",
-                                        "error": result.get("error", "Unknown error"),
-                                        "success": False,
-                                    }
-                                )
-                        else:
-                            # Simple batch insert (faster but no duplicate prevention)
-                            insert_result = db.insert_row(table_name, data)
-                            if insert_result.get("success"):
-                                created_count += 1
-                                results.append(
-                                    {
-                                        "index": i,
-                                        "action": "created",
-                                        "id": insert_result.get("id"),
-                                        "success": True,
-                                    }
-                                )
-                            else:
-                                failed_count += 1
-                                results.append(
-                                    {
-                                        "index": i,
-                                        "action": "failed",
-                                        "error": insert_result.get("error", "Unknown error"),
-                                        "success": False,
-                                    }
-                                )
-
-                    except Exception as item_error:
-                        failed_count += 1
-                        results.append(
-                            {
-                                "index": i,
-                                "action": "failed",
-                                "error": str(item_error),
-                                "success": False,
-                            }
-                        )
-
-                # Commit transaction if all operations successful or partial success
-                # allowed
-                trans.commit()
-
-            except Exception as batch_error:
-                # Rollback transaction on any critical error
-                trans.rollback()
-                raise batch_error
+        if use_upsert and match_columns:
+            # Batch upsert: every row is matched and written inside one transaction
+            upsert_result = db.upsert_rows_bulk(table_name, data_list, match_columns)
+            for i, item in enumerate(upsert_result.get("results", [])):
+                if item["action"] == "created":
+                    created_count += 1
+                else:
+                    updated_count += 1
+                results.append({"index": i, **item, "success": True})
+        else:
+            # Simple batch insert: one transaction, all rows succeed or none do
+            insert_result = db.insert_rows_bulk(table_name, data_list)
+            created_count = len(data_list)
+            results = [{"index": i, "action": "created", "id": row_id, "success": True} for i, row_id in enumerate(insert_result["ids"])]
 
         return cast(
             ToolResponse,
@@ -344,7 +278,6 @@ def batch_create_memories(
                 "success": True,
                 "created": created_count,
                 "updated": updated_count,
-                "failed": failed_count,
                 "total_processed": len(data_list),
                 "transaction_committed": True,
                 "results": results,
@@ -394,10 +327,9 @@ def batch_delete_memories(table_name: str, where_conditions: List[Dict[str, Any]
             },
         )
 
-    import os
+    from .. import server
 
-    db_path = os.environ.get("DB_PATH", "./test.db")
-    db = get_database(db_path)
+    db = get_database(server.DB_PATH)
 
     deleted_count = 0
     failed_count = 0
@@ -523,15 +455,17 @@ def batch_delete_memories(table_name: str, where_conditions: List[Dict[str, Any]
                         }
                     )
 
-        return cast(ToolResponse,
-                    {"success": True,
-                     "deleted": deleted_count,
-                     "failed": failed_count,
-                     "total_conditions": len(where_conditions),
-                     "results": results,
-                     "message": f"Processed {len(where_conditions)} deletion conditions: {deleted_count} records deleted, {failed_count} operations failed",
-                     },
-                    )
+        return cast(
+            ToolResponse,
+            {
+                "success": True,
+                "deleted": deleted_count,
+                "failed": failed_count,
+                "total_conditions": len(where_conditions),
+                "results": results,
+                "message": f"Processed {len(where_conditions)} deletion conditions: {deleted_count} records deleted, {failed_count} operations failed",
+            },
+        )
 
     except Exception as e:
         return cast(
@@ -28,7 +28,7 @@ from typing import Any, Dict, List, Optional, cast
 
 from sqlalchemy import text
 
-from ..database import get_database
+from ..database import get_database, is_internal_table
 from .. import server
 from ..types import ToolResponse
 from ..utils import filter_embedding_columns, get_content_columns
@@ -419,7 +419,7 @@ def _collect_graph_data(
     with database.engine.connect() as conn:
         # Get all tables
         tables_result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"))
-        all_tables = [row[0] for row in tables_result.fetchall()]
+        all_tables = [row[0] for row in tables_result.fetchall() if not is_internal_table(row[0])]
 
         if filter_tables:
             all_tables = [t for t in all_tables if t in filter_tables]
@@ -93,11 +93,12 @@ def search_content(
     query: str,
     tables: Optional[List[str]] = None,
     limit: int = 50,
+    prefix: bool = False,
 ) -> ToolResponse:
     """Perform full-text search across table content using natural language queries."""
     from .. import server
 
-    return cast(ToolResponse, get_database(server.DB_PATH).search_content(query, tables, limit))
+    return cast(ToolResponse, get_database(server.DB_PATH).search_content(query, tables, limit, prefix))
 
 
 @catch_errors
@@ -114,6 +115,14 @@ def explore_tables(
     )
 
 
+@catch_errors
+def create_search_index(table_name: str) -> ToolResponse:
+    """Build the full-text index search_content uses for a table's text columns."""
+    from .. import server
+
+    return cast(ToolResponse, get_database(server.DB_PATH).create_search_index(table_name))
+
+
 @catch_errors
 def add_embeddings(
     table_name: str,
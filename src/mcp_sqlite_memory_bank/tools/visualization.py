@@ -14,7 +14,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union, cast
 import webbrowser
 
 from ..types import ToolResponse
-from ..database import get_database
+from ..database import get_database, is_internal_table
 
 
 def generate_knowledge_graph(
@@ -222,7 +222,7 @@ class KnowledgeGraphAnalyzer:
             ORDER BY name
         """
         )
-        return [row[0] for row in cursor.fetchall()]
+        return [row[0] for row in cursor.fetchall() if not is_internal_table(row[0])]
 
     def _get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
         """Get column information for a table."""
@@ -24,6 +24,9 @@ from .types import (
 
 T = TypeVar("T", bound=Callable[..., ToolResponse])
 
+# Valid SQLite identifier (table/column name), compiled once for the validators below
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 
 # ============================================================================
 # EMBEDDING FILTERING UTILITIES
@@ -136,7 +139,7 @@ def validate_identifier(name: str, context: str = "identifier") -> None:
         name: The identifier to validate
         context: Description of what's being validated (for error messages)
     """
-    if not bool(re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", name)):
+    if not _IDENTIFIER_RE.match(name):
         raise ValidationError(
             f"Invalid {context}: {name}. Must start with letter/underscore and " f"contain only letters, numbers, underscores.",
             {"invalid_name": name},
@@ -270,6 +273,121 @@ def build_where_clause(where: Dict[str, Any], valid_columns: List[str]) -> Union
         return {"success": False, "error": f"Error building WHERE clause: {e}"}
 
 
+# Recovery hints for suggest_recovery, checked in priority order. A rule applies
+# when the lowercased error text contains every "all of" substring and at least
+# one "any of" substring; only the first matching rule is used.
+_RECOVERY_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...], Dict[str, Any]], ...] = (
+    # Dependency-related errors
+    (
+        (),
+        ("sentence-transformers", "transformers"),
+        {
+            "auto_recovery_available": True,
+            "install_command": "pip install sentence-transformers",
+            "manual_steps": [
+                "Install sentence-transformers: pip install sentence-transformers",
+                "Restart the MCP server",
+                "Try the semantic search operation again",
+            ],
+            "explanation": "Semantic search requires the sentence-transformers library",
+            "fallback_available": "Keyword search is available as fallback",
+        },
+    ),
+    # Database errors
+    (
+        (),
+        ("database", "sqlite"),
+        {
+            "manual_steps": [
+                "Check if database file exists and is writable",
+                "Verify disk space is available",
+                "Check if another process is using the database",
+                "Try creating a new database file",
+            ],
+            "auto_recovery_available": False,
+            "diagnostics": {
+                "check_db_path": "Verify DB_PATH environment variable",
+                "check_permissions": "Ensure write permissions to database directory",
+            },
+        },
+    ),
+    # Table/schema errors
+    (
+        ("table",),
+        ("not exist", "missing"),
+        {
+            "auto_recovery_available": True,
+            "manual_steps": [
+                "List available tables with list_tables()",
+                "Check table name spelling",
+                "Create the table if it doesn't exist",
+                "Refresh your table list",
+            ],
+            "next_actions": ["call list_tables() to see available tables"],
+        },
+    ),
+    # Column errors
+    (
+        ("column",),
+        ("not exist", "invalid"),
+        {
+            "auto_recovery_available": True,
+            "manual_steps": [
+                "Use describe_table() to see available columns",
+                "Check column name spelling and case",
+                "Verify the column exists in the table schema",
+            ],
+            "next_actions": ["call describe_table() to see column schema"],
+        },
+    ),
+    # Import/module errors
+    (
+        (),
+        ("import", "module"),
+        {
+            "manual_steps": [
+                "Check if required packages are installed",
+                "Verify Python environment is correct",
+                "Try reinstalling the package",
+                "Check for version compatibility issues",
+            ],
+            "diagnostics": {
+                "python_version": sys.version,
+                "check_packages": "pip list | grep -E '(torch|transformers|sentence)'",
+            },
+        },
+    ),
+    # Function/method errors (like our recent 'FunctionTool' issue)
+    (
+        (),
+        ("not callable", "has no attribute"),
+        {
+            "manual_steps": [
+                "Check if you're using the correct function/method name",
+                "Verify the object type is what you expect",
+                "Check for import issues or namespace conflicts",
+                "Try restarting the MCP server",
+            ],
+            "diagnostics": {
+                "object_type": "Check the actual type of the object being called",
+                "namespace_check": "Verify imports and module loading",
+            },
+            "likely_causes": [
+                "Using PyPI version instead of local development code",
+                "Import conflicts between different module versions",
+                "Object not properly initialized",
+            ],
+        },
+    ),
+)
+
+_SEMANTIC_CONTEXT_HELP: Dict[str, str] = {
+    "semantic_search_help": "Semantic search requires sentence-transformers and embeddings to be generated",
+    "embedding_help": "Use add_embeddings() and generate_embeddings() before semantic search",
+    "fallback_option": "Consider using search_content() for keyword-based search",
+}
+
+
 def suggest_recovery(error: Exception, function_name: str) -> Dict[str, Any]:
     """
     Suggest recovery actions based on the error type and context.
@@ -281,7 +399,7 @@ def suggest_recovery(error: Exception, function_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary with recovery suggestions
     """
-    suggestions = {
+    suggestions: Dict[str, Any] = {
         "auto_recovery_available": False,
         "manual_steps": [],
         "documentation_links": [],
@@ -290,115 +408,16 @@ def suggest_recovery(error: Exception, function_name: str) -> Dict[str, Any]:
 
     error_str = str(error).lower()
 
-    # Dependency-related errors
-    if "sentence-transformers" in error_str or "transformers" in error_str:
-        suggestions.update(
-            {
-                "auto_recovery_available": True,
-                "install_command": "pip install sentence-transformers",
-                "manual_steps": [
-                    "Install sentence-transformers: pip install sentence-transformers",
-                    "Restart the MCP server",
-                    "Try the semantic search operation again",
-                ],
-                "explanation": "Semantic search requires the sentence-transformers library",
-                "fallback_available": "Keyword search is available as fallback",
-            }
-        )
-
-    # Database errors
-    elif "database" in error_str or "sqlite" in error_str:
-        suggestions.update(
-            {
-                "manual_steps": [
-                    "Check if database file exists and is writable",
-                    "Verify disk space is available",
-                    "Check if another process is using the database",
-                    "Try creating a new database file",
-                ],
-                "auto_recovery_available": False,
-                "diagnostics": {
-                    "check_db_path": "Verify DB_PATH environment variable",
-                    "check_permissions": "Ensure write permissions to database directory",
-                },
-            }
-        )
-
-    # Table/schema errors
-    elif "table" in error_str and ("not exist" in error_str or "missing" in error_str):
-        suggestions.update(
-            {
-                "auto_recovery_available": True,
-                "manual_steps": [
-                    "List available tables with list_tables()",
-                    "Check table name spelling",
-                    "Create the table if it doesn't exist",
-                    "Refresh your table list",
-                ],
-                "next_actions": ["call list_tables() to see available tables"],
-            }
-        )
-
-    # Column errors
-    elif "column" in error_str and ("not exist" in error_str or "invalid" in error_str):
-        suggestions.update(
-            {
-                "auto_recovery_available": True,
-                "manual_steps": [
-                    "Use describe_table() to see available columns",
-                    "Check column name spelling and case",
-                    "Verify the column exists in the table schema",
-                ],
-                "next_actions": ["call describe_table() to see column schema"],
-            }
-        )
-
-    # Import/module errors
-    elif "import" in error_str or "module" in error_str:
-        suggestions.update(
-            {
-                "manual_steps": [
-                    "Check if required packages are installed",
-                    "Verify Python environment is correct",
-                    "Try reinstalling the package",
-                    "Check for version compatibility issues",
-                ],
-                "diagnostics": {
-                    "python_version": sys.version,
-                    "check_packages": "pip list | grep -E '(torch|transformers|sentence)'",
-                },
-            }
-        )
-
-    # Function/method errors (like our recent 'FunctionTool' issue)
-    elif "not callable" in error_str or "has no attribute" in error_str:
-        suggestions.update(
-            {
-                "manual_steps": [
-                    "Check if you're using the correct function/method name",
-                    "Verify the object type is what you expect",
-                    "Check for import issues or namespace conflicts",
-                    "Try restarting the MCP server",
-                ],
-                "diagnostics": {
-                    "object_type": "Check the actual type of the object being called",
-                    "namespace_check": "Verify imports and module loading",
-                },
-                "likely_causes": [
-                    "Using PyPI version instead of local development code",
-                    "Import conflicts between different module versions",
-                    "Object not properly initialized",
-                ],
-            }
-        )
+    for all_of, any_of, template in _RECOVERY_RULES:
+        if all(term in error_str for term in all_of) and any(term in error_str for term in any_of):
+            # Callers may mutate the result, so copy the template's lists and dicts;
+            # they only hold strings, so one level of copying is enough
+            suggestions.update({key: value.copy() if isinstance(value, (list, dict)) else value for key, value in template.items()})
+            break
 
     # Add context-specific suggestions
     if function_name.startswith("semantic") or function_name.startswith("embedding"):
-        suggestions["context_help"] = {
-            "semantic_search_help": "Semantic search requires sentence-transformers and embeddings to be generated",
-            "embedding_help": "Use add_embeddings() and generate_embeddings() before semantic search",
-            "fallback_option": "Consider using search_content() for keyword-based search",
-        }
+        suggestions["context_help"] = dict(_SEMANTIC_CONTEXT_HELP)
 
     return suggestions
 
@@ -26,6 +26,10 @@ def extract_result(resp: Sequence[T]) -> Dict[str, Any]:
 
     r = resp[0]
 
+    # Handle direct dict responses (already decoded, nothing to parse)
+    if isinstance(r, dict):
+        return r
+
     # Handle TextContent with JSON text
     if hasattr(r, "text") and isinstance(getattr(r, "text"), str):
         try:
@@ -48,10 +52,6 @@ def extract_result(resp: Sequence[T]) -> Dict[str, Any]:
                 "parse_error": str(e),
             }
 
-    # Handle direct dict responses
-    if isinstance(r, dict):
-        return r
-
     # Handle objects with model_dump method (Pydantic models)
     if hasattr(r, "model_dump") and callable(getattr(r, "model_dump")):
         try:
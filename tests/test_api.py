@@ -1,10 +1,13 @@
 import os
+import sqlite3
 import tempfile
+from contextlib import closing
 import pytest
 import json
 from typing import Any, Dict, cast, TypeVar, Sequence
 from fastmcp import Client
 from mcp_sqlite_memory_bank import server as smb
+from mcp_sqlite_memory_bank.self_healing import DatabaseDiagnostic
 
 # Check for semantic search dependencies
 try:
@@ -21,6 +24,8 @@ T = TypeVar("T")
 def extract_result(resp: Sequence[T]) -> Dict[str, Any]:
     """Helper to extract tool output as dict from FastMCP Client response."""
     r = resp[0]
+    if isinstance(r, dict):
+        return r
     if hasattr(r, "text") and isinstance(getattr(r, "text"), str):
         try:
             return json.loads(getattr(r, "text"))
@@ -34,8 +39,6 @@ def extract_result(resp: Sequence[T]) -> Dict[str, Any]:
             return json.loads(r)
         except json.JSONDecodeError:
             return {"success": False, "error": f"Invalid JSON response: {r}"}
-    if isinstance(r, dict):
-        return r
     if hasattr(r, "model_dump") and callable(getattr(r, "model_dump")):
         return cast(Dict[str, Any], getattr(r, "model_dump")())
     return {"success": False, "error": f"Unexpected response format: {r}"}
@@ -491,6 +494,114 @@ async def test_batch_operations(temp_db):
         assert "error" in bad_out
 
 
+@pytest.mark.asyncio
+async def test_batch_create_memories_bulk_insert(temp_db):
+    """Test that plain batch inserts are applied in one all-or-nothing transaction."""
+    async with Client(smb.app) as client:
+        await client.call_tool(
+            "create_table",
+            {
+                "table_name": "bulk_test",
+                "columns": [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "name", "type": "TEXT"},
+                    {"name": "value", "type": "INTEGER"},
+                ],
+            },
+        )
+
+        # Mixed column sets are allowed within one batch
+        data_list = [{"name": f"item{i}", "value": i} for i in range(1, 4)] + [{"name": "no_value"}]
+        batch = await client.call_tool(
+            "batch_create_memories",
+            {"table_name": "bulk_test", "data_list": data_list, "use_upsert": False},
+        )
+        batch_out = extract_result(batch)
+        assert batch_out["success"]
+        assert batch_out["created"] == 4
+        assert [r["index"] for r in batch_out["results"]] == [0, 1, 2, 3]
+        assert "failed" not in batch_out
+
+        rows = extract_result(await client.call_tool("read_rows", {"table_name": "bulk_test"}))
+        assert [r["name"] for r in rows["rows"]] == ["item1", "item2", "item3", "no_value"]
+        # Each result carries the id of the row it created
+        assert [r["id"] for r in batch_out["results"]] == [r["id"] for r in rows["rows"]]
+        assert rows["rows"][3]["value"] is None
+
+        # An invalid row rolls back the whole batch
+        bad = await client.call_tool(
+            "batch_create_memories",
+            {
+                "table_name": "bulk_test",
+                "data_list": [{"name": "item4"}, {"nonexistent": 1}],
+                "use_upsert": False,
+            },
+        )
+        bad_out = extract_result(bad)
+        assert not bad_out["success"]
+
+        rows = extract_result(await client.call_tool("read_rows", {"table_name": "bulk_test"}))
+        assert len(rows["rows"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_create_memories_upsert(temp_db):
+    """Test that batch upserts match existing rows, including rows created earlier in the batch."""
+    async with Client(smb.app) as client:
+        await client.call_tool(
+            "create_table",
+            {
+                "table_name": "prefs",
+                "columns": [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "key", "type": "TEXT"},
+                    {"name": "value", "type": "TEXT"},
+                ],
+            },
+        )
+        await client.call_tool("create_row", {"table_name": "prefs", "data": {"key": "theme", "value": "light"}})
+
+        batch = await client.call_tool(
+            "batch_create_memories",
+            {
+                "table_name": "prefs",
+                "data_list": [
+                    {"key": "theme", "value": "dark"},
+                    {"key": "font", "value": "mono"},
+                    {"key": "font", "value": "serif"},
+                ],
+                "match_columns": ["key"],
+            },
+        )
+        batch_out = extract_result(batch)
+        assert batch_out["success"]
+        assert (batch_out["created"], batch_out["updated"]) == (1, 2)
+        assert [r["action"] for r in batch_out["results"]] == ["updated", "created", "updated"]
+        assert batch_out["results"][0]["id"] == 1
+        # Updates report the same per-row fields as upsert_memory
+        assert batch_out["results"][0]["rows_affected"] == 1
+        assert batch_out["results"][0]["updated_fields"] == {"value": {"old": "light", "new": "dark"}}
+        assert batch_out["results"][2]["updated_fields"] == {"value": {"old": "mono", "new": "serif"}}
+        assert batch_out["results"][1]["id"] == batch_out["results"][2]["id"]
+
+        rows = extract_result(await client.call_tool("read_rows", {"table_name": "prefs"}))
+        assert {r["key"]: r["value"] for r in rows["rows"]} == {"theme": "dark", "font": "serif"}
+
+        # An invalid row rolls back the whole batch
+        bad = await client.call_tool(
+            "batch_create_memories",
+            {
+                "table_name": "prefs",
+                "data_list": [{"key": "theme", "value": "blue"}, {"nonexistent": 1}],
+                "match_columns": ["key"],
+            },
+        )
+        assert not extract_result(bad)["success"]
+
+        rows = extract_result(await client.call_tool("read_rows", {"table_name": "prefs", "where": {"key": "theme"}}))
+        assert rows["rows"][0]["value"] == "dark"
+
+
 # --- Semantic Search and Advanced Features Tests ---
 
 
@@ -554,6 +665,131 @@ async def test_search_content_functionality(temp_db):
         assert len(search2_out["results"]) >= 1
 
 
+@pytest.mark.asyncio
+async def test_search_content_index_stays_in_sync(temp_db):
+    """Test that the FTS5 search index follows row changes and stays hidden."""
+    async with Client(smb.app) as client:
+        await client.call_tool(
+            "create_table",
+            {
+                "table_name": "notes",
+                "columns": [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "title", "type": "TEXT"},
+                    {"name": "body", "type": "TEXT"},
+                ],
+            },
+        )
+        await client.call_tool("create_row", {"table_name": "notes", "data": {"title": "Gardening", "body": "Tomatoes need sun"}})
+
+        async def search_ids(query):
+            out = extract_result(await client.call_tool("search_content", {"query": query, "tables": ["notes"]}))
+            assert out["success"]
+            return sorted(r["row_id"] for r in out["results"])
+
+        # Searching is read-only: without an index it scans, and creates nothing
+        db_path = smb.DB_PATH
+
+        def schema_objects():
+            with closing(sqlite3.connect(db_path)) as raw:
+                return raw.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]
+
+        schema_before = schema_objects()
+        assert await search_ids("tomato") == [1]
+        assert schema_objects() == schema_before
+
+        # The index is built on request from the existing rows
+        index = extract_result(await client.call_tool("create_search_index", {"table_name": "notes"}))
+        assert index["success"]
+        assert index["columns"] == ["title", "body"]
+        assert await search_ids("tomato") == [1]
+
+        # Later writes are picked up by the sync triggers
+        await client.call_tool("create_row", {"table_name": "notes", "data": {"title": "Cooking", "body": "Tomato soup"}})
+        assert await search_ids("tomato") == [1, 2]
+
+        await client.call_tool("update_rows", {"table_name": "notes", "data": {"body": "Peppers need sun"}, "where": {"id": 1}})
+        assert await search_ids("tomato") == [2]
+        assert await search_ids("peppers") == [1]
+
+        await client.call_tool("delete_rows", {"table_name": "notes", "where": {"id": 2}})
+        assert await search_ids("tomato") == []
+
+        # Queries shorter than a trigram still work through the LIKE fallback
+        assert await search_ids("un") == [1]
+
+        # Index tables never show up as user tables, nor in diagnostics
+        tables = extract_result(await client.call_tool("list_tables", {}))
+        assert tables["tables"] == ["notes"]
+        diagnostics = DatabaseDiagnostic(db_path).run_comprehensive_check()
+        assert (diagnostics["table_count"], diagnostics["total_rows"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_search_content_relevance_scores(temp_db):
+    """Test the relevance formula, including queries that repeat a term."""
+    async with Client(smb.app) as client:
+        await client.call_tool(
+            "create_table",
+            {"table_name": "snippets", "columns": [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "body", "type": "TEXT"}]},
+        )
+        await client.call_tool("create_row", {"table_name": "snippets", "data": {"body": "tomato tomato"}})
+        await client.call_tool("create_row", {"table_name": "snippets", "data": {"body": "sun sun"}})
+
+        async def relevance(query):
+            out = extract_result(await client.call_tool("search_content", {"query": query, "tables": ["snippets"]}))
+            return [r["relevance"] for r in out["results"]]
+
+        # exact 2*2/13 + terms 2/13 + position 0.1
+        assert await relevance("tomato") == [round(6 / 13 + 0.1, 4)]
+        # exact 1*2/7 + terms 2*2/7 + position 0.1
+        assert await relevance("sun sun") == [round(6 / 7 + 0.1, 4)]
+
+        # Snippets keep 50 characters of context either side of the first match
+        await client.call_tool("create_row", {"table_name": "snippets", "data": {"body": "x" * 60 + "Pepper" + "y" * 60}})
+        out = extract_result(await client.call_tool("search_content", {"query": "pepper", "tables": ["snippets"]}))
+        assert out["results"][0]["matched_content"] == ["body: ..." + "x" * 50 + "Pepper" + "y" * 50 + "..."]
+
+
+@pytest.mark.asyncio
+async def test_search_content_merges_tables(temp_db):
+    """Test that tables scanned concurrently are merged into one ranking."""
+    async with Client(smb.app) as client:
+        bodies = {"alpha": "kiwi", "beta": "kiwi and mango", "gamma": "mango only"}
+        for table_name, body in bodies.items():
+            await client.call_tool(
+                "create_table",
+                {"table_name": table_name, "columns": [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "body", "type": "TEXT"}]},
+            )
+            await client.call_tool("create_row", {"table_name": table_name, "data": {"body": body}})
+
+        out = extract_result(await client.call_tool("search_content", {"query": "kiwi"}))
+        assert out["success"]
+        assert [r["table"] for r in out["results"]] == ["alpha", "beta"]
+        assert out["results"][0]["relevance"] > out["results"][1]["relevance"]
+
+
+@pytest.mark.asyncio
+async def test_search_content_prefix(temp_db):
+    """Test prefix search, including LIKE wildcards in the query."""
+    async with Client(smb.app) as client:
+        await client.call_tool(
+            "create_table",
+            {"table_name": "labels", "columns": [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "label", "type": "TEXT"}]},
+        )
+        for label in ("Tomatoes need sun", "Sunflowers", "50% off", "500 items"):
+            await client.call_tool("create_row", {"table_name": "labels", "data": {"label": label}})
+
+        async def prefix_ids(query):
+            out = extract_result(await client.call_tool("search_content", {"query": query, "tables": ["labels"], "prefix": True}))
+            assert out["success"]
+            return sorted(r["row_id"] for r in out["results"])
+
+        assert await prefix_ids("sun") == [2]
+        assert await prefix_ids("50%") == [3]
+        assert await prefix_ids("5") == [3, 4]
+
+
 @pytest.mark.asyncio
 async def test_explore_tables_functionality(temp_db):
     """Test table exploration and discovery capabilities."""
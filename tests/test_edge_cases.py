@@ -590,3 +590,29 @@ class TestErrorRecovery:
             describe_out = extract_result(describe_result)
             assert describe_out["success"]
             assert len(describe_out["columns"]) == 51  # 1 + 50 columns
+
+    def test_suggest_recovery_rule_priority(self):
+        """Recovery hints follow rule priority and are never shared between calls."""
+        from mcp_sqlite_memory_bank.utils import suggest_recovery
+
+        missing_table = suggest_recovery(Exception("Table 'notes' does not exist"), "read_rows")
+        assert missing_table["next_actions"] == ["call list_tables() to see available tables"]
+
+        # Database errors take priority over table errors
+        db_error = suggest_recovery(Exception("database table is missing"), "read_rows")
+        assert "next_actions" not in db_error
+        assert db_error["diagnostics"]["check_db_path"]
+
+        semantic = suggest_recovery(Exception("sentence-transformers not installed"), "semantic_search")
+        assert semantic["install_command"] == "pip install sentence-transformers"
+        assert "context_help" in semantic
+
+        unknown = suggest_recovery(Exception("something odd"), "read_rows")
+        assert unknown["manual_steps"] == []
+
+        missing_table["manual_steps"].append("mutated")
+        again = suggest_recovery(Exception("Table 'notes' does not exist"), "read_rows")
+        assert "mutated" not in again["manual_steps"]
+
+        db_error["diagnostics"]["mutated"] = True
+        assert "mutated" not in suggest_recovery(Exception("database table is missing"), "read_rows")["diagnostics"]
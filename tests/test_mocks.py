@@ -6,6 +6,7 @@ Focus on testable mock scenarios without complex dependency mocking.
 import os
 import tempfile
 import pytest
+from contextlib import contextmanager
 from unittest.mock import patch
 import json
 from fastmcp import Client
@@ -21,6 +22,12 @@ def temp_db_simple(monkeypatch):
     smb.DB_PATH
     monkeypatch.setattr(smb, "DB_PATH", db_path)
     yield db_path
+
+    # Close pooled connections so SQLite can remove its WAL files
+    from mcp_sqlite_memory_bank.database import _db_instance
+
+    if _db_instance:
+        _db_instance.close()
     try:
         os.remove(db_path)
     except (PermissionError, FileNotFoundError):
@@ -297,3 +304,368 @@ class TestErrorHandlingSimulation:
             result_out = extract_result(result)
 
             assert result_out["success"]
+
+
+class FakeSemanticEngine:
+    """Deterministic stand-in for SemanticSearchEngine that records encode calls."""
+
+    def __init__(self):
+        self.batch_calls = []
+
+    def get_embedding_dimensions(self):
+        return 2
+
+    def generate_embeddings_batch(self, texts):
+        self.batch_calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@contextmanager
+def installed_semantic_engine(engine):
+    """Make the database layer treat semantic search as available and use ``engine``."""
+    with (
+        patch("mcp_sqlite_memory_bank.database.is_semantic_search_available", return_value=True),
+        patch("mcp_sqlite_memory_bank.database.get_semantic_engine", return_value=engine),
+    ):
+        yield engine
+
+
+class TestEmbeddingGenerationMocking:
+    """Test embedding generation with a fake semantic engine."""
+
+    def test_generate_embeddings_encodes_per_batch(self, temp_db_simple):
+        """Rows are encoded one batch at a time and written back in row order."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_simple)
+        db.create_table(
+            "embed_batches",
+            [
+                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                {"name": "title", "type": "TEXT"},
+                {"name": "body", "type": "TEXT"},
+            ],
+        )
+        rows = [
+            {"title": "a", "body": "bb"},
+            {"title": "ccc", "body": None},
+            {"title": "   ", "body": None},
+            {"title": "dddd", "body": "e"},
+        ]
+        for row in rows:
+            db.insert_row("embed_batches", row)
+
+        engine = FakeSemanticEngine()
+        with installed_semantic_engine(engine):
+            result = db.generate_embeddings("embed_batches", ["title", "body"], batch_size=2)
+
+        assert result["success"]
+        assert result["processed"] == 3
+        # Whitespace-only rows are skipped rather than sent to the model
+        assert engine.batch_calls == [["a bb", "ccc"], ["dddd e"]]
+
+        stored = db.read_rows("embed_batches")["rows"]
+        assert [json.loads(r["embedding"])[0] if r["embedding"] else None for r in stored] == [4.0, 3.0, None, 6.0]
+
+    def test_serialize_embedding_is_compact_and_float32_exact(self):
+        """Stored embeddings drop double-precision noise but round-trip at float32."""
+        import numpy as np
+        from mcp_sqlite_memory_bank.semantic import serialize_embedding
+
+        vector = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        # Precision is kept relative to each component, so tiny values survive too
+        vector[:3] = [1.2345678e-7, -3.3333333e-5, 0.0]
+
+        stored = serialize_embedding(vector.tolist())
+        assert " " not in stored
+        assert len(stored) < len(json.dumps(vector.tolist())) * 0.6
+        assert np.array_equal(np.asarray(json.loads(stored), dtype=np.float32), vector)
+
+
+class FakeModel:
+    """Minimal SentenceTransformer stand-in that counts encoded texts."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        import numpy as np
+
+        self.encoded.extend(texts)
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def _make_engine(cache_size=1024):
+    """Build a SemanticSearchEngine backed by FakeModel."""
+    from mcp_sqlite_memory_bank.semantic import SemanticSearchEngine
+
+    with patch("mcp_sqlite_memory_bank.semantic.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+        engine = SemanticSearchEngine("fake-model")
+    engine._model = FakeModel()
+    engine.cache_size = cache_size
+    return engine
+
+
+@pytest.fixture()
+def semantic_engine():
+    """A FakeModel-backed engine installed as the database layer's semantic engine."""
+    with installed_semantic_engine(_make_engine()) as engine:
+        yield engine
+
+
+class TestEmbeddingCacheMocking:
+    """Test the semantic engine's embedding cache without loading a model."""
+
+    def test_batch_reuses_cached_embeddings(self):
+        """Batch encoding only sends uncached, de-duplicated texts to the model."""
+        engine = _make_engine()
+
+        assert engine.generate_embedding("alpha") == [5.0, 1.0]
+        result = engine.generate_embeddings_batch(["alpha", "be", "be", "gamma"])
+
+        assert result == [[5.0, 1.0], [2.0, 1.0], [2.0, 1.0], [5.0, 1.0]]
+        assert engine._model.encoded == ["alpha", "be", "gamma"]
+
+        # Everything is cached now
+        engine.generate_embeddings_batch(["gamma", "be"])
+        assert engine._model.encoded == ["alpha", "be", "gamma"]
+
+    def test_cache_evicts_least_recently_used(self):
+        """The cache is bounded and evicts the least recently used entry."""
+        engine = _make_engine(cache_size=2)
+
+        engine.generate_embedding("one")
+        engine.generate_embedding("two")
+        engine.generate_embedding("one")  # refresh "one"
+        engine.generate_embedding("three")  # evicts "two"
+        engine.generate_embedding("one")
+        engine.generate_embedding("two")
+
+        assert engine._model.encoded == ["one", "two", "three", "two"]
+        assert len(engine._embedding_cache) == 2
+
+    def test_semantic_engine_singleton_and_reset(self):
+        """The global engine is reused per model until the cache is reset."""
+        from mcp_sqlite_memory_bank import semantic
+
+        semantic.reset_semantic_cache()
+        try:
+            with patch("mcp_sqlite_memory_bank.semantic.SENTENCE_TRANSFORMERS_AVAILABLE", True):
+                engine = semantic.get_semantic_engine("fake-model")
+                assert semantic.get_semantic_engine("fake-model") is engine
+
+                semantic.reset_semantic_cache()
+                assert semantic.get_semantic_engine("fake-model") is not engine
+        finally:
+            semantic.reset_semantic_cache()
+
+    def test_find_similar_embeddings_ranks_by_cosine(self):
+        """Similarities are cosine scores, thresholded and sorted descending."""
+        engine = _make_engine()
+
+        candidates = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [0.0, 0.0], [2.0, 0.0]]
+        matches = engine.find_similar_embeddings([1.0, 0.0], candidates, similarity_threshold=0.5, top_k=10)
+
+        assert [idx for idx, _ in matches] == [0, 4, 2]
+        assert matches[0][1] == pytest.approx(1.0)
+        assert matches[2][1] == pytest.approx(0.7071, abs=1e-4)
+
+        top_one = engine.find_similar_embeddings([1.0, 0.0], candidates, similarity_threshold=0.0, top_k=1)
+        assert [idx for idx, _ in top_one] == [0]
+
+    def test_find_similar_embeddings_top_k_partition(self):
+        """Top-k selection over many matches returns the k best in order."""
+        engine = _make_engine()
+
+        candidates = [[1.0, float(i)] for i in range(50)]
+        matches = engine.find_similar_embeddings([1.0, 0.0], candidates, similarity_threshold=0.0, top_k=3)
+
+        assert [idx for idx, _ in matches] == [0, 1, 2]
+        assert engine.find_similar_embeddings([1.0, 0.0], candidates, similarity_threshold=0.0, top_k=0) == []
+
+    def test_score_embeddings_supports_threshold_sweeps(self):
+        """One scoring pass can be filtered at several thresholds."""
+        engine = _make_engine()
+
+        candidates = [[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]
+        scores = engine.score_embeddings([1.0, 0.0], candidates)
+
+        assert scores.shape == (3,)
+        for threshold in (0.1, 0.5, 0.9):
+            expected = [idx for idx, _ in engine.find_similar_embeddings([1.0, 0.0], candidates, threshold, 10)]
+            assert sorted(expected) == [idx for idx, score in enumerate(scores) if score >= threshold]
+
+    def test_score_embeddings_on_prenormalized_matrix(self):
+        """A unit-length candidate matrix scores the same without renormalising."""
+        import numpy as np
+        from mcp_sqlite_memory_bank.semantic import normalize_embeddings
+
+        engine = _make_engine()
+        candidates = np.array([[3.0, 4.0], [1.0, 1.0], [0.0, 2.0]], dtype=np.float32)
+        unit = normalize_embeddings(candidates)
+
+        assert np.allclose(np.linalg.norm(unit, axis=1), 1.0)
+        assert np.allclose(engine.score_embeddings([2.0, 0.0], unit, normalized=True), engine.score_embeddings([2.0, 0.0], candidates))
+
+    def test_semantic_search_merges_tables_searched_concurrently(self, temp_db_simple, semantic_engine):
+        """Per-table results are merged and ranked globally, encoding the query once."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_simple)
+        embeddings = {
+            "notes_a": [[3.0, 1.0], [0.0, 1.0]],
+            "notes_b": [[3.0, 1.5]],
+            "notes_c": [],
+        }
+        for table_name, vectors in embeddings.items():
+            db.create_table(
+                table_name,
+                [
+                    {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                    {"name": "content", "type": "TEXT"},
+                    {"name": "embedding", "type": "TEXT"},
+                ],
+            )
+            for i, vector in enumerate(vectors):
+                db.insert_row(table_name, {"content": f"{table_name} {i}", "embedding": json.dumps(vector)})
+
+        result = db.semantic_search("abc", similarity_threshold=0.5, limit=5)
+
+        assert result["success"]
+        assert [(r["table_name"], r["content"]) for r in result["results"]] == [
+            ("notes_a", "notes_a 0"),
+            ("notes_b", "notes_b 0"),
+        ]
+        assert all("embedding" not in r for r in result["results"])
+        assert semantic_engine._model.encoded == ["abc"]
+
+    def test_semantic_search_top_k_spans_tables(self, temp_db_simple, semantic_engine):
+        """The global top-k is taken over all tables' scores."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_simple)
+        for table_name, vectors in {"top_a": [[0.0, 1.0], [3.0, 1.5]], "top_b": [[3.0, 1.0]]}.items():
+            db.create_table(table_name, [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "content", "type": "TEXT"}])
+            db.add_embedding_column(table_name)
+            db.insert_rows_bulk(table_name, [{"content": f"{table_name} {i}", "embedding": json.dumps(v)} for i, v in enumerate(vectors)])
+
+        first = db.semantic_search("abc", similarity_threshold=0.0, limit=1)
+        second = db.semantic_search("abc", similarity_threshold=0.0, limit=2)
+
+        assert [(r["table_name"], r["content"]) for r in first["results"]] == [("top_b", "top_b 0")]
+        assert [(r["table_name"], r["content"]) for r in second["results"]] == [("top_b", "top_b 0"), ("top_a", "top_a 1")]
+        # Only the matrix and rowids are cached; result rows are fetched per search
+        assert sorted(rowids.tolist() for _, _, rowids in db._embedding_cache.values()) == [[1], [1, 2]]
+
+    def test_find_related_content_scores_decoded_matrix(self, temp_db_simple, semantic_engine):
+        """Related rows are ranked from one decoded matrix, skipping the target and bad payloads."""
+        from mcp_sqlite_memory_bank.database import get_database
+        from mcp_sqlite_memory_bank.types import ValidationError
+
+        db = get_database(temp_db_simple)
+        db.create_table(
+            "related_notes",
+            [
+                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                {"name": "content", "type": "TEXT"},
+                {"name": "embedding", "type": "TEXT"},
+            ],
+        )
+        for content, embedding in (("target", "[1,0]"), ("close", "[1,0.1]"), ("far", "[0,1]"), ("broken", "[1,")):
+            db.insert_row("related_notes", {"content": content, "embedding": embedding})
+
+        result = db.find_related_content("related_notes", 1, similarity_threshold=0.5)
+
+        # The target vector comes from the decoded matrix, which skips bad payloads
+        with pytest.raises(ValidationError, match="does not have an embedding"):
+            db.find_related_content("related_notes", 4)
+
+        assert result["success"]
+        assert [(r["id"], r["content"]) for r in result["results"]] == [(2, "close")]
+        assert "embedding" not in result["results"][0]
+        assert "embedding" not in result["target_row"]
+
+    def test_deserialize_embeddings_skips_invalid_values(self):
+        """Stored embeddings decode into one float32 matrix with their source positions."""
+        from mcp_sqlite_memory_bank.semantic import deserialize_embeddings
+
+        matrix, valid = deserialize_embeddings(["[1,2]", "not json", [3.0, 4.0]])
+
+        assert matrix.dtype.name == "float32"
+        assert matrix.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+        assert valid == [0, 2]
+
+    def test_deserialize_embeddings_without_orjson(self):
+        """The stdlib json fallback decodes and rejects the same payloads."""
+        from mcp_sqlite_memory_bank.semantic import deserialize_embeddings
+
+        with patch("mcp_sqlite_memory_bank.semantic._json_loads", json.loads):
+            matrix, valid = deserialize_embeddings(["[1,2]", "[1,", "[0.5,0.25]"])
+
+        assert matrix.tolist() == [[1.0, 2.0], [0.5, 0.25]]
+        assert valid == [0, 2]
+
+    def test_embedding_matrix_cached_until_table_changes(self, temp_db_simple, semantic_engine):
+        """Decoded embeddings are reused across searches and reloaded after any write."""
+        import sqlite3
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_simple)
+        db.create_table(
+            "cached_notes",
+            [
+                {"name": "id", "type": "INTEGER PRIMARY KEY AUTOINCREMENT"},
+                {"name": "content", "type": "TEXT"},
+                {"name": "embedding", "type": "TEXT"},
+            ],
+        )
+        db.insert_row("cached_notes", {"content": "first", "embedding": "[3,1]"})
+
+        loads = []
+        original = db._load_embedding_matrix
+
+        def search():
+            result = db.semantic_search("abc", tables=["cached_notes"], similarity_threshold=0.5)
+            return [r["content"] for r in result["results"]]
+
+        with patch.object(db, "_load_embedding_matrix", side_effect=lambda *args: (loads.append(1), original(*args))[1]):
+            assert search() == ["first"]
+            assert search() == ["first"]
+            assert len(loads) == 1
+
+            # An in-place update through the database layer invalidates the matrix
+            db.update_rows("cached_notes", {"content": "renamed"}, {"id": 1})
+            assert search() == ["renamed"]
+            assert len(loads) == 2
+
+            # So does a row added by another connection
+            with sqlite3.connect(temp_db_simple) as raw:
+                raw.execute("INSERT INTO cached_notes (content, embedding) VALUES ('second', '[3,1.2]')")
+            assert search() == ["renamed", "second"]
+            assert len(loads) == 3
+
+    def test_embedding_matrix_external_update_seen_after_eviction(self, temp_db_simple, semantic_engine):
+        """Embedding setup adds no triggers; an external in-place update shows once the entry is evicted."""
+        import sqlite3
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_simple)
+        db.create_table("watched_notes", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "content", "type": "TEXT"}])
+        db.add_embedding_column("watched_notes")
+        db.insert_row("watched_notes", {"content": "first", "embedding": "[0,1]"})
+
+        def search():
+            result = db.semantic_search("abc", tables=["watched_notes"], similarity_threshold=0.5)
+            return [r["content"] for r in result["results"]]
+
+        assert search() == []
+
+        # COUNT(*) and MAX(rowid) are unchanged, so the cached matrix is still served
+        with sqlite3.connect(temp_db_simple) as raw:
+            raw.execute("UPDATE watched_notes SET embedding = '[3,1]' WHERE id = 1")
+            assert raw.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone() == (0,)
+        assert search() == []
+
+        db._embedding_cache.clear()
+        assert search() == ["first"]
@@ -559,3 +559,185 @@ class TestResourceUsage:
         print("\nConnection Management Test:")
         print("  Successfully handled multiple sequential connections")
         print("  No connection leaks detected")
+
+    def test_connection_pragmas(self, temp_db_perf):
+        """Test that every pooled connection is configured for WAL mode."""
+        from sqlalchemy import text
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_perf)
+        with db.get_connection() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    def test_connections_are_pooled(self, temp_db_perf):
+        """Test that connections are returned to the pool and reused."""
+        from sqlalchemy.pool import QueuePool
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_perf)
+        assert isinstance(db.engine.pool, QueuePool)
+        with db.get_connection() as conn:
+            first = conn.connection.dbapi_connection
+        with db.get_connection() as conn:
+            assert conn.connection.dbapi_connection is first
+
+    def test_metadata_reflected_only_on_schema_change(self, temp_db_perf, monkeypatch):
+        """Test that read paths reuse reflected metadata until the schema changes."""
+        import sqlite3
+        from mcp_sqlite_memory_bank.database import get_database
+        from mcp_sqlite_memory_bank.types import ValidationError
+
+        db = get_database(temp_db_perf)
+        db.create_table("cached_schema", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "note", "type": "TEXT"}])
+
+        reflections = []
+        original = db._reflect_now
+        monkeypatch.setattr(db, "_reflect_now", lambda: (reflections.append(1), original())[1])
+
+        for _ in range(3):
+            assert "cached_schema" in db.list_all_columns()["schemas"]
+        assert reflections == []
+        assert db._text_columns["cached_schema"] == ["note"]
+
+        # DDL from another connection bumps the schema cookie and is picked up
+        with sqlite3.connect(temp_db_perf) as raw:
+            raw.execute("CREATE TABLE external_table (id INTEGER PRIMARY KEY)")
+        assert "external_table" in db.list_all_columns()["schemas"]
+        assert reflections == [1]
+
+        # list_tables and rename_table answer from the same cache
+        with sqlite3.connect(temp_db_perf) as raw:
+            raw.execute("CREATE TABLE another_external (id INTEGER PRIMARY KEY)")
+        assert db.list_tables()["tables"] == ["another_external", "cached_schema", "external_table"]
+        with pytest.raises(ValidationError):
+            db.rename_table("cached_schema", "another_external")
+
+    def test_explore_tables_counts_rows_in_compound_queries(self, temp_db_perf, monkeypatch):
+        """Test that row counts batched across several UNION ALL queries stay per-table."""
+        import mcp_sqlite_memory_bank.database as database
+
+        db = database.get_database(temp_db_perf)
+        for name, rows in (("count_a", 0), ("count_b", 2), ("count_c", 5)):
+            db.create_table(name, [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "note", "type": "TEXT"}])
+            if rows:
+                db.insert_rows_bulk(name, [{"note": f"row {i}"} for i in range(rows)])
+
+        monkeypatch.setattr(database, "MAX_COMPOUND_SELECT", 2)
+        exploration = db.explore_tables(pattern="count_")["exploration"]
+
+        assert {t["name"]: t["row_count"] for t in exploration["tables"]} == {"count_a": 0, "count_b": 2, "count_c": 5}
+        assert exploration["total_rows"] == 7
+
+    def test_database_instance_not_pinned_by_exit_hook(self, tmp_path):
+        """Test that the atexit close hook does not keep discarded instances alive."""
+        import gc
+        import weakref
+        from mcp_sqlite_memory_bank.database import SQLiteMemoryDatabase
+
+        db = SQLiteMemoryDatabase(str(tmp_path / "transient.db"))
+        ref = weakref.ref(db)
+        del db
+        gc.collect()
+        assert ref() is None
+
+    def test_in_memory_database_shares_one_connection(self, tmp_path, monkeypatch):
+        """Test that :memory: keeps its data across calls and never touches the filesystem."""
+        from sqlalchemy.pool import StaticPool
+        from mcp_sqlite_memory_bank.database import SQLiteMemoryDatabase
+
+        monkeypatch.chdir(tmp_path)
+        db = SQLiteMemoryDatabase(":memory:")
+        try:
+            assert isinstance(db.engine.pool, StaticPool)
+            db.create_table("scratch", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "note", "type": "TEXT"}])
+            db.insert_row("scratch", {"note": "kept"})
+            assert db.read_rows("scratch")["rows"] == [{"id": 1, "note": "kept"}]
+            assert db.db_path == ":memory:"
+            assert list(tmp_path.iterdir()) == []
+        finally:
+            db.close()
+
+    def test_crud_statements_cached_by_shape(self, temp_db_perf):
+        """Test that CRUD statements are reused across values and rebuilt after DDL."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_perf)
+        db.create_table("shapes", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "tag", "type": "TEXT"}])
+        assert db.insert_rows_bulk("shapes", [{"tag": "a"}, {"tag": "b"}, {"tag": None}])["ids"] == [1, 2, 3]
+
+        assert [r["id"] for r in db.read_rows("shapes", {"tag": "a"})["rows"]] == [1]
+        cached = len(db._statement_cache)
+        assert [r["id"] for r in db.read_rows("shapes", {"tag": "b"})["rows"]] == [2]
+        assert len(db._statement_cache) == cached
+
+        # None compares with IS NULL, so it gets its own statement
+        assert [r["id"] for r in db.read_rows("shapes", {"tag": None})["rows"]] == [3]
+        assert db.select_query("shapes", ["tag"], {"id": 2}, limit=5)["rows"] == [{"tag": "b"}]
+        assert db.update_rows("shapes", {"tag": "c"}, {"tag": None})["rows_affected"] == 1
+        assert db.delete_rows("shapes", {"tag": "c"})["rows_affected"] == 1
+        assert [r["id"] for r in db.read_rows("shapes", limit=1)["rows"]] == [1]
+
+        db.create_table("other_shapes", [{"name": "id", "type": "INTEGER PRIMARY KEY"}])
+        assert db._statement_cache == {}
+
+    def test_bulk_insert_ids_match_rowids(self, temp_db_perf):
+        """Test that bulk insert ids match the stored rows across executemany runs and explicit ids."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_perf)
+        db.create_table("numbered", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "tag", "type": "TEXT"}])
+        rows = [{"tag": "a"}, {"tag": "b"}, {"id": 20, "tag": "c"}, {"id": 10, "tag": "d"}, {"tag": "e"}, {"tag": "f"}]
+
+        ids = db.insert_rows_bulk("numbered", rows)["ids"]
+
+        assert ids == [1, 2, 20, 10, 21, 22]
+        stored = {r["id"]: r["tag"] for r in db.read_rows("numbered")["rows"]}
+        assert [stored[row_id] for row_id in ids] == ["a", "b", "c", "d", "e", "f"]
+
+    def test_embedded_rows_use_partial_index(self, temp_db_perf):
+        """Test that embedded-row scans and counts go through the partial index."""
+        from sqlalchemy import event, func, select
+
+        from mcp_sqlite_memory_bank.database import get_database
+
+        db = get_database(temp_db_perf)
+        db.create_table("sparse", [{"name": "id", "type": "INTEGER PRIMARY KEY"}, {"name": "body", "type": "TEXT"}])
+        db.insert_rows_bulk("sparse", [{"body": f"row {i}"} for i in range(20)])
+        db.add_embedding_column("sparse")
+        db.update_rows("sparse", {"embedding": "[1.0,0.0]"}, {"id": 3})
+        db.update_rows("sparse", {"embedding": "null"}, {"id": 4})
+
+        table = db._ensure_table_exists("sparse")
+        stmt = select(func.count()).select_from(table).where(db._has_embedding(table, "embedding"))
+        with db.get_connection() as conn:
+            compiled = stmt.compile(conn)
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", tuple(compiled.params[k] for k in compiled.positiontup)).fetchall()
+        assert any("ix_sparse_embedding_embedded" in row[-1] for row in plan)
+
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        stats = db.get_embedding_stats("sparse")
+        assert stats["total_rows"] == 20
+        assert stats["embedded_rows"] == 1
+        assert stats["embedding_dimensions"] == 2
+        assert len(statements) == 1
+
+        # The stats statement is built once and reused
+        cached = len(db._statement_cache)
+        assert db.get_embedding_stats("sparse")["embedded_rows"] == 1
+        assert len(db._statement_cache) == cached
+
+    def test_database_instance_reused_for_relative_path(self, tmp_path, monkeypatch):
+        """Test that a relative DB path reuses the cached database instance."""
+        from mcp_sqlite_memory_bank.database import get_database
+
+        monkeypatch.chdir(tmp_path)
+        db = get_database("./relative.db")
+        try:
+            assert get_database("./relative.db") is db
+            assert get_database(str(tmp_path / "relative.db")) is db
+        finally:
+            db.close()